@@ -0,0 +1,73 @@
+import json
+import platform
+import time
+from pathlib import Path
+
+BASELINE_DIR = Path(__file__).with_name("baselines")
+
+
+def baseline_path(name):
+    return BASELINE_DIR / f"{name}.json"
+
+
+def time_call(func, iterations, repeats):
+    func()
+    best = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = (time.perf_counter() - started) / iterations
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def load(path):
+    path = Path(path)
+    if not path.exists():
+        return None
+    with path.open("r", encoding="utf-8") as file_handle:
+        return json.load(file_handle)["results"]
+
+
+def save(path, results, **metadata):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        **metadata,
+        "results": results,
+    }
+    with path.open("w", encoding="utf-8") as file_handle:
+        json.dump(data, file_handle, indent=2, sort_keys=True)
+        file_handle.write("\n")
+    return path
+
+
+def compare(results, baseline, tolerance, slack=0.0):
+    regressions = []
+    for name, value in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if value > expected * (1 + tolerance) and value - expected > slack:
+            regressions.append((name, expected, value))
+    return regressions
+
+
+def check(results, path, tolerance, slack=0.0, unit="ms", rerun=None):
+    baseline = load(path)
+    if baseline is None:
+        print(f"no baseline at {path}; run with --save-baseline to create one")
+        return
+    regressions = compare(results, baseline, tolerance, slack)
+    if regressions and rerun is not None:
+        for name, _, _ in regressions:
+            results[name] = min(results[name], rerun(name))
+        regressions = compare(results, baseline, tolerance, slack)
+    for name, expected, value in regressions:
+        print(f"REGRESSION {name}: {value:.3f} {unit} vs baseline {expected:.3f} {unit}")
+    if regressions:
+        raise SystemExit(f"{len(regressions)} benchmark(s) regressed more than {tolerance:.0%}")
+    print(f"all {len(results)} benchmarks within {tolerance:.0%} of {Path(path).name}")
@@ -0,0 +1,68 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+import board_batch
+from sudoku import SudokuBoard
+
+
+def build_corpus(count, seed):
+    rng = random.Random(seed)
+    board = SudokuBoard(rng=rng)
+    grids = []
+    while len(grids) < count:
+        board.generate(rng.choice(("easy", "medium", "hard")))
+        grids.append(board.to_grid())
+        solution = board.solution_grid()
+        if rng.random() < 0.3:
+            solution[rng.randrange(81)] = rng.randrange(1, 10)
+        grids.append(solution)
+    return np.array(grids[:count], dtype=np.uint8)
+
+
+def loop_audit(grids):
+    board = SudokuBoard()
+    wins = []
+    for grid in grids:
+        board.load_puzzle(grid)
+        wins.append(board.check_win())
+        board.get_conflicts()
+        for index in range(81):
+            board.candidate_mask(index // 9, index % 9)
+    return wins
+
+
+def batch_audit(grids):
+    return board_batch.audit(grids)["win"]
+
+
+def timed(func, grids):
+    started = time.perf_counter()
+    result = func(grids)
+    return time.perf_counter() - started, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare per-board and NumPy audits.")
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    grids = build_corpus(args.count, args.seed)
+    loop_seconds, loop_wins = timed(loop_audit, grids.tolist())
+    batch_seconds, batch_wins = timed(batch_audit, grids)
+    if list(batch_wins) != loop_wins:
+        raise SystemExit("Batch and per-board results disagree")
+
+    print(f"boards: {len(grids)}")
+    for label, seconds in (("per-board loop", loop_seconds), ("numpy batch", batch_seconds)):
+        print(f"{label}: {seconds * 1000:.1f} ms ({len(grids) / seconds:.0f} boards/sec)")
+    print(f"speedup: {loop_seconds / batch_seconds:.1f}x")
+    propagate_seconds, _ = timed(board_batch.propagate_singles, grids)
+    print(f"one singles round: {propagate_seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
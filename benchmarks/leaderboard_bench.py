@@ -0,0 +1,96 @@
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import config
+import scoreboard
+from tests.scoreboard_writers import run_writers
+
+
+def make_entries(count, seed):
+    rng = random.Random(seed)
+    return [{"name": f"player{index}", "score": rng.randrange(10000)} for index in range(count)]
+
+
+def timed_ms(func, repeats=1):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - started) * 1000 / repeats
+
+
+def run_size(directory, count, seed, updates):
+    scoreboard._score_path = lambda: directory / config.SCOREBOARD_FILE
+    scoreboard._db_path = lambda: directory / config.SCOREBOARD_DB_FILE
+    scoreboard.save_scores(make_entries(count, seed))
+    rng = random.Random(seed)
+    names = [f"player{rng.randrange(count)}" for _ in range(updates)]
+    rows = []
+
+    config.SCOREBOARD_BACKEND = "journal"
+    rows.append(("journal cold load", timed_ms(scoreboard._cached)))
+    rows.append(
+        (
+            "journal cached top-k",
+            timed_ms(lambda: scoreboard.get_leaderboard(config.LEADERBOARD_MAX_ENTRIES), 20),
+        )
+    )
+    started = time.perf_counter()
+    for index, name in enumerate(names):
+        scoreboard.update_score(name, index)
+    rows.append(("journal update", (time.perf_counter() - started) * 1000 / updates))
+    scoreboard.compact()
+
+    config.SCOREBOARD_BACKEND = "sqlite"
+    rows.append(("sqlite migrate", timed_ms(scoreboard._database)))
+    rows.append(
+        (
+            "sqlite top-k",
+            timed_ms(lambda: scoreboard.get_leaderboard(config.LEADERBOARD_MAX_ENTRIES), 20),
+        )
+    )
+    started = time.perf_counter()
+    for index, name in enumerate(names):
+        scoreboard.update_score(name, index)
+    rows.append(("sqlite upsert", (time.perf_counter() - started) * 1000 / updates))
+    scoreboard.close_databases()
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare leaderboard backends.")
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--updates", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--writers", default="", help="e.g. 1,4,16 to measure contention")
+    parser.add_argument("--writes", type=int, default=200, help="updates per writer")
+    parser.add_argument("--batch", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.writers:
+        for writers in (int(count) for count in args.writers.split(",")):
+            with tempfile.TemporaryDirectory() as tmp:
+                elapsed = run_writers(
+                    tmp, writers, args.writes, args.batch, config.SCOREBOARD_JOURNAL_MAX_BYTES
+                )
+                scoreboard._score_path = lambda: Path(tmp) / config.SCOREBOARD_FILE
+                stored = len(scoreboard.load_scores())
+            updates = writers * args.writes * 2
+            print(
+                f"{writers:3} writers  {updates / elapsed:9.0f} updates/s  "
+                f"{stored} entries stored, {writers * (args.writes + 1)} expected"
+            )
+        return
+
+    for count in (int(size) for size in args.sizes.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            rows = run_size(Path(tmp), count, args.seed, args.updates)
+        print(f"{count} entries")
+        for label, ms in rows:
+            print(f"  {label:20} {ms:10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import argparse
+import os
+import random
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import config
+import overlays
+import ui
+from benchmarks import baseline
+from sudoku import SudokuBoard
+
+LONG_MESSAGE = (
+    "Cell already filled. Press backspace to clear, or pick another cell "
+    "and try a different digit before the timer runs out."
+)
+
+
+def make_fonts():
+    return {
+        "counter": pygame.font.Font(None, config.COUNTER_FONT_SIZE),
+        "cell": pygame.font.Font(None, config.CELL_FONT_SIZE),
+        "console": pygame.font.Font(None, config.CONSOLE_FONT_SIZE),
+    }
+
+
+def make_boards(seed):
+    rng = random.Random(seed)
+    puzzle = SudokuBoard(rng=rng)
+    puzzle.generate("hard")
+    solved = puzzle.copy()
+    solved.fill_from(puzzle.solution_grid())
+    conflicted = puzzle.copy()
+    for index, value in enumerate(puzzle.to_grid()):
+        if value == 0 and rng.random() < 0.5:
+            conflicted.set_value(index // 9, index % 9, rng.randrange(1, 10))
+    return {
+        "empty": SudokuBoard(),
+        "puzzle": puzzle,
+        "conflicts": conflicted,
+        "solved": solved,
+    }
+
+
+def make_log(count, message):
+    activity_log = ui.ActivityLog()
+    for index in range(count):
+        activity_log.append(f"{index}: {message}")
+    return activity_log
+
+
+def make_entries(count):
+    return [{"name": f"Player {index}", "score": 1000 - index * 7} for index in range(count)]
+
+
+def build_cases(screen, fonts, theme, seed):
+    boards = make_boards(seed)
+    buttons = ui.create_buttons()
+    logs = {
+        "empty": ui.ActivityLog(),
+        "short": make_log(20, "Valid move! (+2 pts)"),
+        "long": make_log(config.MAX_CONSOLE_MESSAGES, LONG_MESSAGE),
+    }
+    ui.prepare_theme(fonts, theme)
+    cases = {}
+
+    for name, board in boards.items():
+        cases[f"draw_grid/{name}"] = lambda board=board: ui.draw_grid(
+            screen, board, (4, 4), fonts, theme, (2, 7)
+        )
+    for name, activity_log in logs.items():
+        cases[f"draw_console/{name}"] = lambda activity_log=activity_log: ui.draw_console(
+            screen, fonts, activity_log, theme
+        )
+    cases["draw_console/short_cold"] = lambda: ui.draw_console(
+        screen, fonts, make_log(20, "Valid move! (+2 pts)"), theme
+    )
+    cases["draw_console/long_cold"] = lambda: ui.draw_console(
+        screen, fonts, make_log(config.MAX_CONSOLE_MESSAGES, LONG_MESSAGE), theme
+    )
+    cases["draw_buttons"] = lambda: ui.draw_buttons(screen, fonts, buttons, theme)
+    cases["draw_move_counter"] = lambda: ui.draw_move_counter(screen, fonts, 42, 1234, theme)
+    cases["draw_static_layer"] = lambda: ui.draw_static_layer(screen, fonts, buttons, theme)
+    for count in (0, config.LEADERBOARD_MAX_ENTRIES, 100000):
+        leaderboard = overlays.LeaderboardOverlay(make_entries(count))
+        leaderboard.scroll_to(count // 2)
+        cases[f"leaderboard/{count}_entries"] = lambda overlay=leaderboard: overlay.draw(
+            screen, fonts, theme
+        )
+
+    scrolling = overlays.LeaderboardOverlay(make_entries(100000))
+
+    def leaderboard_scroll():
+        if not scrolling.scroll(1):
+            scrolling.scroll_to(0)
+        scrolling.draw(screen, fonts, theme)
+
+    cases["leaderboard/100000_scroll"] = leaderboard_scroll
+
+    renderer = ui.DirtyRenderer()
+    frame = [0]
+
+    def full_frame(draw_background):
+        frame[0] += 1
+        draw_background(screen, fonts, buttons, theme)
+        ui.draw_grid(screen, boards["puzzle"], (frame[0] % 9, frame[0] // 9 % 9), fonts, theme)
+        ui.draw_move_counter(screen, fonts, frame[0] % 50, 1234, theme)
+        ui.draw_console(screen, fonts, logs["short"], theme)
+
+    uncached = ui.TextCache(0)
+
+    def uncached_frame():
+        text_cache = ui.text_cache
+        ui.text_cache = uncached
+        try:
+            full_frame(ui.draw_static_layer)
+        finally:
+            ui.text_cache = text_cache
+
+    def dirty_frame():
+        frame[0] += 1
+        renderer.render(
+            screen,
+            boards["puzzle"],
+            fonts,
+            buttons,
+            theme,
+            (frame[0] % 9, frame[0] // 9 % 9),
+            move_count=frame[0] % 50,
+            console_messages=logs["short"],
+        )
+
+    cases["frame/uncached"] = uncached_frame
+    cases["frame/text_cache"] = lambda: full_frame(ui.draw_static_layer)
+    cases["frame/layer"] = lambda: full_frame(ui.draw_background)
+    cases["frame/dirty"] = dirty_frame
+    return cases
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time ui draw functions offscreen.")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--theme", default=config.DEFAULT_THEME, choices=sorted(config.THEMES))
+    parser.add_argument("--filter", default="", help="only run cases containing this text")
+    parser.add_argument("--baseline", type=Path, default=baseline.baseline_path("render"))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--slack-ms", type=float, default=0.02)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    cases = build_cases(screen, make_fonts(), config.THEMES[args.theme], args.seed)
+
+    def run(name):
+        return round(baseline.time_call(cases[name], args.iterations, args.repeats), 4)
+
+    results = {}
+    for name in cases:
+        if args.filter not in name:
+            continue
+        results[name] = run(name)
+        print(f"{name:32} {results[name]:8.3f} ms  {1000 / results[name]:10.0f} /sec")
+
+    if args.save_baseline:
+        path = baseline.save(args.baseline, results, theme=args.theme, seed=args.seed)
+        print(f"baseline saved to {path}")
+    else:
+        baseline.check(results, args.baseline, args.tolerance, args.slack_ms, rerun=run)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+import argparse
+import importlib
+import random
+import time
+import tracemalloc
+from pathlib import Path
+
+import config
+from benchmarks import baseline
+from exact_cover import NodeBudgetExceeded
+from sudoku import SudokuBoard, available_solvers, get_solver
+
+ADVERSARIAL = {
+    "brute_force": (
+        "000000000000003085001020000000507000004000100090000000500000073002010000000040009"
+    ),
+    "escargot": (
+        "100007090030020008009600500005300900010080002600004000300000010040000007007000300"
+    ),
+    "platinum_blonde": (
+        "000000012000000003002300400001800005060070800000009000008500000900040500470006000"
+    ),
+    "clue17": (
+        "000000010400000000020000000000050407008000300001090000300400200050100000000806000"
+    ),
+}
+
+COUNTS = ("nodes", "backtracks", "propagated", "solver_calls")
+METRICS = ("ms", *COUNTS, "peak_kib")
+
+
+def parse_grid(text):
+    return [int(char) for char in text]
+
+
+def build_corpus(seed, count):
+    corpus = {}
+    for offset, difficulty in enumerate(config.DIFFICULTIES):
+        board = SudokuBoard(rng=random.Random(seed + offset))
+        grids = []
+        for _ in range(count):
+            board.generate(difficulty, unique=config.UNIQUE_PUZZLES)
+            grids.append(board.to_grid())
+        corpus[difficulty] = grids
+    for name, text in ADVERSARIAL.items():
+        corpus[f"adversarial/{name}"] = [parse_grid(text)]
+    return corpus
+
+
+def solve_all(method, grids, max_nodes):
+    board = SudokuBoard()
+    metrics = getattr(get_solver(method), "metrics", ())
+    totals = dict.fromkeys(metrics, 0)
+    totals["budget"] = 0
+    for grid in grids:
+        board.load_puzzle(grid)
+        try:
+            board.solve(method, max_nodes)
+        except NodeBudgetExceeded:
+            totals["budget"] += 1
+        for metric in metrics:
+            totals[metric] += getattr(board.last_solve_stats, metric)
+    if "propagated" in totals and "nodes" in totals:
+        totals["nodes"] += totals["propagated"]
+    return totals
+
+
+def fill_board(seed):
+    board = SudokuBoard(rng=random.Random(seed))
+    board._fill_board()
+    return board
+
+
+def generate(difficulty, seed):
+    board = SudokuBoard(rng=random.Random(seed))
+    board.generate(difficulty, unique=config.UNIQUE_PUZZLES)
+    return board
+
+
+def peak_kib(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def best_ms(func, repeats):
+    best = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def build_cases(corpus, solvers, seed, max_nodes):
+    cases = {}
+    for method in solvers:
+        for group, grids in corpus.items():
+            cases[f"solve/{method}/{group}"] = lambda method=method, grids=grids: solve_all(
+                method, grids, max_nodes
+            )
+    cases["fill_board"] = lambda: fill_board(seed)
+    for difficulty in config.DIFFICULTIES:
+        cases[f"generate/{difficulty}"] = lambda difficulty=difficulty: generate(
+            difficulty, seed
+        )
+    return cases
+
+
+def measure(func, repeats):
+    outcome = func()
+    row = {"ms": round(best_ms(func, repeats), 3), "peak_kib": round(peak_kib(func), 1)}
+    if isinstance(outcome, dict):
+        row.update(outcome)
+        return row
+    stats = outcome.last_generate_stats
+    row["nodes"] = stats.nodes
+    row["backtracks"] = stats.backtracks
+    if stats.unique:
+        row["solver_calls"] = stats.solver_calls
+    return row
+
+
+def rank(rows, solvers):
+    totals = []
+    for method in solvers:
+        prefix = f"solve/{method}/"
+        solved = [row for name, row in rows.items() if name.startswith(prefix)]
+        if not solved:
+            continue
+        totals.append(
+            (
+                sum(row["budget"] for row in solved),
+                sum(row["ms"] for row in solved),
+                sum(row["nodes"] for row in solved) if "nodes" in solved[0] else None,
+                method,
+            )
+        )
+    return sorted(totals, key=lambda total: (total[0], total[1], total[3]))
+
+
+def flatten(rows):
+    results = {}
+    for name, row in rows.items():
+        for metric in METRICS:
+            if metric in row:
+                results[f"{name}.{metric}"] = row[metric]
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time solvers and the generator on a corpus.")
+    parser.add_argument("--count", type=int, default=5, help="puzzles per difficulty")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-nodes", type=int, default=50000)
+    parser.add_argument("--solvers", default="", help="comma-separated; default is all")
+    parser.add_argument(
+        "--import",
+        dest="modules",
+        action="append",
+        default=[],
+        help="module that calls register_solver() for an extra backend",
+    )
+    parser.add_argument("--filter", default="", help="only run cases containing this text")
+    parser.add_argument("--baseline", type=Path, default=baseline.baseline_path("solver"))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--slack-ms", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    for module in args.modules:
+        importlib.import_module(module)
+    solvers = [name for name in args.solvers.split(",") if name] or list(available_solvers())
+    corpus = build_corpus(args.seed, args.count)
+    cases = build_cases(corpus, solvers, args.seed, args.max_nodes)
+
+    rows = {}
+    for name, func in cases.items():
+        if args.filter not in name:
+            continue
+        rows[name] = row = measure(func, args.repeats)
+        counts = "".join(f" {row[metric]:9} {metric}" for metric in COUNTS if metric in row)
+        budget = f"  {row['budget']} over budget" if row.get("budget") else ""
+        print(f"{name:44} {row['ms']:9.2f} ms {row['peak_kib']:8.1f} KiB{counts}{budget}")
+
+    ranking = rank(rows, solvers)
+    if ranking:
+        print("\nranking (over-budget puzzles, then total ms):")
+        for place, (budget, total_ms, nodes, method) in enumerate(ranking, 1):
+            nodes = "" if nodes is None else f" {nodes:9} nodes"
+            print(f"{place}. {method:16} {total_ms:9.2f} ms{nodes}  {budget} over budget")
+
+    def rerun(name):
+        case, metric = name.rsplit(".", 1)
+        if metric != "ms":
+            return results[name]
+        return round(best_ms(cases[case], args.repeats), 3)
+
+    results = flatten(rows)
+    if args.save_baseline:
+        path = baseline.save(
+            args.baseline,
+            results,
+            seed=args.seed,
+            count=args.count,
+            max_nodes=args.max_nodes,
+            unique=config.UNIQUE_PUZZLES,
+        )
+        print(f"baseline saved to {path}")
+    else:
+        baseline.check(
+            results, args.baseline, args.tolerance, args.slack_ms, unit="", rerun=rerun
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import numpy as np
+
+from sudoku import CELL_UNITS, DIGIT_MASK, UNIT_CELLS
+
+_CELL_UNITS = np.array(CELL_UNITS, dtype=np.intp)
+_UNIT_CELLS = np.array(UNIT_CELLS, dtype=np.intp)
+_CELL_UNIT_SLOTS = (_CELL_UNITS * 10).reshape(1, 243)
+_DIGIT_BITS = np.left_shift(np.uint16(1), np.arange(10, dtype=np.uint16))
+
+
+def as_boards(boards):
+    array = np.asarray(boards)
+    if array.ndim == 1:
+        array = array.reshape(1, -1)
+    if array.ndim != 2 or array.shape[1] != 81:
+        raise ValueError(f"Expected an (N, 81) array, got shape {array.shape}")
+    if array.size and (array.min() < 0 or array.max() > 9):
+        raise ValueError("Board values must be between 0 and 9")
+    return array.astype(np.uint8, copy=False)
+
+
+def _slots(boards):
+    return _CELL_UNIT_SLOTS + np.repeat(boards, 3, axis=1)
+
+
+def unit_counts(boards):
+    boards = as_boards(boards)
+    count = len(boards)
+    offsets = (np.arange(count, dtype=np.intp) * 270)[:, None]
+    flat = np.bincount((_slots(boards) + offsets).ravel(), minlength=count * 270)
+    return flat.reshape(count, 27, 10).astype(np.uint8)
+
+
+def _conflict_cells(boards, counts):
+    own = np.take_along_axis(counts.reshape(len(boards), 270), _slots(boards), axis=1)
+    return (boards != 0) & (own.reshape(-1, 81, 3) > 1).any(axis=2)
+
+
+def conflict_cells(boards):
+    boards = as_boards(boards)
+    return _conflict_cells(boards, unit_counts(boards))
+
+
+def is_complete(boards):
+    return (as_boards(boards) != 0).all(axis=1)
+
+
+def is_consistent(boards):
+    return ~conflict_cells(boards).any(axis=1)
+
+
+def check_win(boards):
+    boards = as_boards(boards)
+    return is_complete(boards) & is_consistent(boards)
+
+
+def _candidate_masks(counts):
+    unit_masks = (counts > 0).astype(np.uint16) @ _DIGIT_BITS
+    cell_masks = (
+        unit_masks[:, _CELL_UNITS[:, 0]]
+        | unit_masks[:, _CELL_UNITS[:, 1]]
+        | unit_masks[:, _CELL_UNITS[:, 2]]
+    )
+    return ~cell_masks & np.uint16(DIGIT_MASK)
+
+
+def candidate_masks(boards):
+    return _candidate_masks(unit_counts(boards))
+
+
+def audit(boards):
+    boards = as_boards(boards)
+    counts = unit_counts(boards)
+    conflicts = _conflict_cells(boards, counts)
+    complete = (boards != 0).all(axis=1)
+    consistent = ~conflicts.any(axis=1)
+    return {
+        "complete": complete,
+        "consistent": consistent,
+        "win": complete & consistent,
+        "conflicts": conflicts,
+        "candidates": _candidate_masks(counts),
+    }
+
+
+def propagate_singles(boards):
+    boards = as_boards(boards)
+    counts = unit_counts(boards)
+    empty = boards == 0
+    masks = _candidate_masks(counts)
+    candidates = (masks[:, :, None] & _DIGIT_BITS[1:]) != 0
+    candidates &= empty[:, :, None]
+
+    forced = candidates & (candidates.sum(axis=2, keepdims=True) == 1)
+    unit_candidates = candidates[:, _UNIT_CELLS, :]
+    places = unit_candidates.sum(axis=2)
+    board_index, unit, digit = np.nonzero(places == 1)
+    position = unit_candidates[board_index, unit, :, digit].argmax(axis=1)
+    forced[board_index, _UNIT_CELLS[unit, position], digit] = True
+
+    result = boards.copy()
+    decided = forced.any(axis=2)
+    result[decided] = forced.argmax(axis=2).astype(np.uint8)[decided] + 1
+
+    missing = counts[:, :, 1:] == 0
+    dead_ends = (empty & (masks == 0)).any(axis=1)
+    dead_ends |= (missing & (places == 0)).any(axis=(1, 2))
+    dead_ends |= (forced.sum(axis=2) > 1).any(axis=1)
+    dead_ends |= _conflict_cells(result, unit_counts(result)).any(axis=1)
+    return result, dead_ends
@@ -14,30 +14,64 @@ BUTTON_MARGIN_RIGHT = 20
 BUTTON_START_Y = 150
 
 INSTRUCTIONS_WIDTH = 800
-INSTRUCTIONS_HEIGHT = 600
+INSTRUCTIONS_HEIGHT = 680
 
 LEADERBOARD_WIDTH = 700
 LEADERBOARD_HEIGHT = 520
 LEADERBOARD_MAX_ENTRIES = 10
+LEADERBOARD_PAGE_SIZE = 100
+LEADERBOARD_SCROLL_ROWS = 3
+LEADERBOARD_ROW_CACHE_PAGES = 3
+LEADERBOARD_BUCKET_SIZE = 512
 
 NAME_PROMPT_WIDTH = 520
 NAME_PROMPT_HEIGHT = 260
 NAME_MAX_LENGTH = 16
 
 SCOREBOARD_FILE = "leaderboard.json"
+SCOREBOARD_BACKEND = "journal"
+SCOREBOARD_DB_FILE = "leaderboard.sqlite3"
+SCOREBOARD_JOURNAL_SUFFIX = ".journal"
+SCOREBOARD_JOURNAL_MAX_BYTES = 64 * 1024
+SCOREBOARD_BATCH_SIZE = 1
+SCOREBOARD_LOCK_TIMEOUT = 5.0
+SCOREBOARD_LOCK_RETRY_MS = 1
+SCOREBOARD_LOCK_MAX_RETRY_MS = 50
+SCOREBOARD_UI_LOCK_TIMEOUT = 0.2
+SCOREBOARD_RETRY_SECONDS = 2.0
+
+SOLVER_METHOD = "dlx"
+SOLVER_TIME_BUDGET = 15.0
+SOLVER_NODE_BUDGET = 5_000_000
+SOLVER_INLINE_NODE_BUDGET = 2000
+VISUAL_SOLVE_FRAME_BUDGET_MS = 8
+VISUAL_SOLVE_STEPS_PER_FRAME = 20
+UNIQUE_PUZZLES = True
+DIFFICULTIES = ("easy", "medium", "hard")
+PUZZLE_POOL_SIZE = 3
+PUZZLE_BANK_FILE = "puzzles.bank"
 
 MAX_CONSOLE_MESSAGES = 100
 CONSOLE_VISIBLE_LINES = 24
 
+TEXT_CACHE_SIZE = 512
+DIRTY_RECT_RENDERING = True
+
+FPS = 60
+IDLE_MODE = True
+IDLE_WAIT_MS = 500
+
+PROFILER_WINDOW = 600
+PROFILER_WORST_FRAMES = 5
+PROFILER_HUD_INTERVAL = 30
+PROFILER_EXPORT_NAME = "frame_profile"
+
 COUNTER_FONT_SIZE = 24
 CELL_FONT_SIZE = 34
 CONSOLE_FONT_SIZE = 28
 
 WINDOW_CAPTION = "Sudoku"
-INSTRUCTIONS_CAPTION = "Instructions"
 ACTIVITY_LOG_TEXT = "Activity Log"
-LEADERBOARD_CAPTION = "Leaderboard"
-NAME_PROMPT_CAPTION = "Save Score"
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -64,6 +98,7 @@ THEMES = {
         "muted_text": (160, 180, 200),
         "given_text": (125, 180, 255),
         "user_text": (230, 240, 250),
+        "conflict_text": (255, 125, 125),
         "selected": (86, 165, 255),
         "button_text": (230, 238, 246),
         "button": {
@@ -88,6 +123,7 @@ THEMES = {
         "muted_text": (60, 80, 100),
         "given_text": (30, 85, 150),
         "user_text": (15, 30, 45),
+        "conflict_text": (185, 40, 45),
         "selected": (60, 130, 200),
         "button_text": (20, 35, 50),
         "button": {
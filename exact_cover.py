@@ -0,0 +1,209 @@
+CONSTRAINT_COUNT = 324
+CANDIDATE_ROWS = 729
+
+
+class NodeBudgetExceeded(Exception):
+    pass
+
+
+def _row_columns(candidate):
+    cell, digit_index = divmod(candidate, 9)
+    row, col = divmod(cell, 9)
+    box = (row // 3) * 3 + col // 3
+    return (
+        cell,
+        81 + row * 9 + digit_index,
+        162 + col * 9 + digit_index,
+        243 + box * 9 + digit_index,
+    )
+
+
+class ExactCoverSolver:
+    def __init__(self):
+        size = 1 + CONSTRAINT_COUNT + CANDIDATE_ROWS * 4
+        self.left = [0] * size
+        self.right = [0] * size
+        self.up = [0] * size
+        self.down = [0] * size
+        self.column = [0] * size
+        self.candidate = [0] * size
+        self.sizes = [0] * (CONSTRAINT_COUNT + 1)
+        self.nodes = 0
+        self.backtracks = 0
+        self._build()
+
+    def _build(self):
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column = self.column
+        for header in range(CONSTRAINT_COUNT + 1):
+            left[header] = header - 1
+            right[header] = header + 1
+            up[header] = header
+            down[header] = header
+            column[header] = header
+        left[0] = CONSTRAINT_COUNT
+        right[CONSTRAINT_COUNT] = 0
+
+        node = CONSTRAINT_COUNT + 1
+        for candidate in range(CANDIDATE_ROWS):
+            first = node
+            for constraint in _row_columns(candidate):
+                header = constraint + 1
+                column[node] = header
+                self.candidate[node] = candidate
+                up[node] = up[header]
+                down[node] = header
+                down[up[header]] = node
+                up[header] = node
+                self.sizes[header] += 1
+                left[node] = node - 1
+                right[node] = node + 1
+                node += 1
+            left[first] = node - 1
+            right[node - 1] = first
+
+    def _first_node(self, candidate):
+        return CONSTRAINT_COUNT + 1 + candidate * 4
+
+    def _cover(self, header):
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column, sizes = self.column, self.sizes
+        right[left[header]] = right[header]
+        left[right[header]] = left[header]
+        row = down[header]
+        while row != header:
+            node = right[row]
+            while node != row:
+                down[up[node]] = down[node]
+                up[down[node]] = up[node]
+                sizes[column[node]] -= 1
+                node = right[node]
+            row = down[row]
+
+    def _uncover(self, header):
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column, sizes = self.column, self.sizes
+        row = up[header]
+        while row != header:
+            node = left[row]
+            while node != row:
+                sizes[column[node]] += 1
+                down[up[node]] = node
+                up[down[node]] = node
+                node = left[node]
+            row = up[row]
+        right[left[header]] = header
+        left[right[header]] = header
+
+    def _select(self, row):
+        node = self.right[row]
+        while node != row:
+            self._cover(self.column[node])
+            node = self.right[node]
+
+    def _deselect(self, row):
+        node = self.left[row]
+        while node != row:
+            self._uncover(self.column[node])
+            node = self.left[node]
+
+    def _choose_column(self):
+        right, sizes = self.right, self.sizes
+        best = right[0]
+        best_size = sizes[best]
+        header = right[best]
+        while header != 0 and best_size > 1:
+            if sizes[header] < best_size:
+                best = header
+                best_size = sizes[header]
+            header = right[header]
+        return best
+
+    def iter_solutions(self, grid, max_nodes=None):
+        self.nodes = 0
+        self.backtracks = 0
+        givens = []
+        used = set()
+        for cell, value in enumerate(grid):
+            if not value:
+                continue
+            candidate = cell * 9 + value - 1
+            constraints = _row_columns(candidate)
+            if used.intersection(constraints):
+                return
+            used.update(constraints)
+            givens.append(self._first_node(candidate))
+
+        stack = []
+        applied = []
+        try:
+            for row in givens:
+                self._cover(self.column[row])
+                self._select(row)
+                applied.append(row)
+
+            right, down, column = self.right, self.down, self.column
+            while True:
+                if right[0] == 0:
+                    solution = list(grid)
+                    for row in stack:
+                        cell, digit_index = divmod(self.candidate[row], 9)
+                        solution[cell] = digit_index + 1
+                    yield solution
+                else:
+                    header = self._choose_column()
+                    self._cover(header)
+                    row = down[header]
+                    if row != header:
+                        self._select(row)
+                        stack.append(row)
+                        self.nodes += 1
+                        if max_nodes is not None and self.nodes > max_nodes:
+                            raise NodeBudgetExceeded(self.nodes)
+                        continue
+                    self._uncover(header)
+
+                while stack:
+                    row = stack.pop()
+                    self._deselect(row)
+                    self.backtracks += 1
+                    header = column[row]
+                    row = down[row]
+                    if row != header:
+                        self._select(row)
+                        stack.append(row)
+                        self.nodes += 1
+                        if max_nodes is not None and self.nodes > max_nodes:
+                            raise NodeBudgetExceeded(self.nodes)
+                        break
+                    self._uncover(header)
+                else:
+                    return
+        finally:
+            while stack:
+                row = stack.pop()
+                self._deselect(row)
+                self._uncover(self.column[row])
+            while applied:
+                row = applied.pop()
+                self._deselect(row)
+                self._uncover(self.column[row])
+
+    def solve(self, grid, max_nodes=None):
+        solutions = self.iter_solutions(grid, max_nodes)
+        try:
+            return next(solutions, None)
+        finally:
+            solutions.close()
+
+    def count_solutions(self, grid, limit=None, max_nodes=None):
+        count = 0
+        solutions = self.iter_solutions(grid, max_nodes)
+        try:
+            for _ in solutions:
+                count += 1
+                if limit is not None and count >= limit:
+                    break
+        finally:
+            solutions.close()
+        return count
@@ -0,0 +1,89 @@
+import argparse
+import multiprocessing
+import random
+import sys
+import time
+
+import config
+import puzzle_bank
+from sudoku import SudokuBoard
+
+
+def _generate_chunk(task):
+    seed, difficulty, chunk_index, count, unique = task
+    board = SudokuBoard(rng=random.Random(f"{seed}:{difficulty}:{chunk_index}"))
+    records = []
+    for _ in range(count):
+        if board.generate(difficulty, unique=unique):
+            records.append(
+                puzzle_bank.pack_record(difficulty, board.to_grid(), board.solution_grid())
+            )
+    return records
+
+
+def _chunk_tasks(seed, difficulty, count, chunk_size, unique):
+    tasks = []
+    for chunk_index, start in enumerate(range(0, count, chunk_size)):
+        size = min(chunk_size, count - start)
+        tasks.append((seed, difficulty, chunk_index, size, unique))
+    return tasks
+
+
+def build_bank(path, count, difficulties, workers, seed, chunk_size, unique, report=print):
+    results = {}
+    with puzzle_bank.BankWriter(path) as writer, multiprocessing.Pool(workers) as pool:
+        for difficulty in difficulties:
+            started = time.perf_counter()
+            written = 0
+            tasks = _chunk_tasks(seed, difficulty, count, chunk_size, unique)
+            for records in pool.imap(_generate_chunk, tasks):
+                writer.write_records(records)
+                written += len(records)
+            elapsed = time.perf_counter() - started
+            rate = written / elapsed if elapsed else 0.0
+            results[difficulty] = rate
+            report(f"{difficulty}: {written} puzzles in {elapsed:.2f}s ({rate:.1f} puzzles/sec)")
+    return results
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Generate a Sudoku puzzle bank.")
+    parser.add_argument("--count", type=int, default=1000, help="puzzles per difficulty")
+    parser.add_argument(
+        "--difficulty",
+        action="append",
+        choices=config.DIFFICULTIES,
+        help="difficulty to generate (repeatable, default all)",
+    )
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=25)
+    parser.add_argument("--output", default=str(puzzle_bank.bank_path()))
+    parser.add_argument(
+        "--allow-multiple-solutions",
+        action="store_true",
+        help="skip the uniqueness check",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    difficulties = tuple(args.difficulty or config.DIFFICULTIES)
+    print(
+        f"Writing {args.count} puzzles per difficulty to {args.output} "
+        f"with {args.workers} workers"
+    )
+    build_bank(
+        args.output,
+        args.count,
+        difficulties,
+        args.workers,
+        args.seed,
+        args.chunk_size,
+        not args.allow_multiple_solutions,
+    )
+
+
+if __name__ == "__main__":
+    main()
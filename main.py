@@ -1,13 +1,110 @@
 import sys
+import time
 
 import pygame
 
 import config
+import overlays
+import profiler
 import scoring
 import scoreboard
+import solver_worker
 import ui
+from puzzle_bank import PuzzleBank
+from puzzle_pool import PuzzlePool
 from sudoku import SudokuBoard
 
+SOLVER_MESSAGES = {
+    solver_worker.NO_SOLUTION: "No solution found.",
+    solver_worker.NODE_BUDGET: "Solver stopped: node budget reached.",
+    solver_worker.TIMED_OUT: "Solver timed out.",
+    solver_worker.CANCELLED: "Solver cancelled.",
+    solver_worker.FAILED: "Solver stopped unexpectedly.",
+}
+
+
+def start_solver(board, solve_job, visual_solve, console_messages):
+    if solve_job is not None or visual_solve is not None:
+        ui.log_message(console_messages, "Solver already running.")
+        return solve_job
+    ui.log_message(console_messages, "Solving... (Esc to cancel)")
+    return solver_worker.SolveJob(board.to_grid())
+
+
+def finish_solver(board, solve_job, tracker, console_messages):
+    result = solve_job.result
+    if result.status != solver_worker.SOLVED:
+        ui.log_message(console_messages, SOLVER_MESSAGES[result.status])
+        return
+    if board.to_grid() != solve_job.grid:
+        ui.log_message(console_messages, "Board changed; solver result discarded.")
+        return
+    board.fill_from(result.grid)
+    tracker.mark_solver_solved()
+    ui.log_message(console_messages, f"Solver nodes visited: {result.nodes}")
+    ui.log_message(console_messages, "Sudoku solved using solver!")
+
+
+def finish_visual_solve(visual_solve, tracker, console_messages):
+    progress = visual_solve.progress
+    if not progress.solved:
+        ui.log_message(console_messages, "No solution found.")
+        return
+    tracker.mark_solver_solved()
+    ui.log_message(
+        console_messages,
+        f"{progress.assignments} assignments, {progress.backtracks} backtracks.",
+    )
+    ui.log_message(console_messages, "Sudoku solved visually!")
+
+
+def finish_overlay(overlay_stack, overlay, console_messages):
+    if isinstance(overlay, overlays.SaveScorePrompt):
+        if overlay.result:
+            overlay_stack.push(overlays.NamePrompt(overlay.score))
+        else:
+            ui.log_message(console_messages, "Score not saved.")
+    elif isinstance(overlay, overlays.NamePrompt):
+        if overlay.result:
+            try:
+                scoreboard.update_score(
+                    overlay.result, overlay.score, config.SCOREBOARD_UI_LOCK_TIMEOUT
+                )
+            except (scoreboard.LockTimeout, OSError):
+                ui.log_message(
+                    console_messages,
+                    f"Leaderboard busy; score for {overlay.result} will be saved shortly.",
+                )
+            else:
+                ui.log_message(console_messages, f"Score saved for {overlay.result}.")
+        else:
+            ui.log_message(console_messages, "Score not saved.")
+
+
+def retry_pending_scores(console_messages):
+    try:
+        saved = scoreboard.flush(config.SCOREBOARD_UI_LOCK_TIMEOUT)
+    except (scoreboard.LockTimeout, OSError):
+        return
+    if saved:
+        ui.log_message(console_messages, f"Saved {saved} pending score(s).")
+
+
+def log_pool_stats(pool, console_messages):
+    stats = pool.stats()
+    ready = ", ".join(f"{name} {count}" for name, count in stats["ready"].items())
+    ui.log_message(console_messages, f"Pool ready: {ready}.")
+    ui.log_message(
+        console_messages,
+        f"Refills: {stats['refills']}, avg {stats['average_refill_ms']:.1f} ms, "
+        f"last {stats['last_refill_ms']:.1f} ms.",
+    )
+    ui.log_message(
+        console_messages,
+        f"Pool: {stats['hits']} hits, {stats['misses']} misses, "
+        f"{stats['bank_draws']} from bank.",
+    )
+
 
 def main():
     pygame.init()
@@ -23,32 +120,57 @@ def main():
     }
 
     board = SudokuBoard()
+    pool = PuzzlePool(bank=PuzzleBank.load())
+    pool.start()
     selected_cell = None
+    solve_job = None
+    visual_solve = None
     move_count = 0
     tracker = scoring.ScoreTracker()
-    console_messages = []
+    console_messages = ui.ActivityLog()
     win_condition = False
 
     theme_name = config.DEFAULT_THEME
     theme = config.THEMES[theme_name]
+    ui.prepare_theme(fonts, theme)
 
     buttons = ui.create_buttons()
-    clock = pygame.time.Clock()
+    renderer = ui.DirtyRenderer()
+    pacer = ui.FramePacer()
+    overlay_stack = overlays.OverlayStack()
+    frame_profiler = profiler.FrameProfiler()
+    profile_lines = None
+    score_retry_at = 0.0
     running = True
 
     while running:
-        for event in pygame.event.get():
+        animating = solve_job is not None or visual_solve is not None
+        events = pacer.next_events(animating)
+        frame_profiler.begin_frame()
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
                 break
 
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                renderer.invalidate()
+
+            if overlay_stack.handle_event(event):
+                continue
+
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 selected_cell = ui.get_cell_from_mouse(event.pos)
                 mouse_pos = event.pos
 
+                if visual_solve is not None and any(
+                    buttons[name].collidepoint(mouse_pos) for name in config.DIFFICULTIES
+                ):
+                    visual_solve.cancel()
+                    visual_solve = None
+
                 if buttons["easy"].collidepoint(mouse_pos):
                     console_messages.clear()
-                    if board.generate("easy"):
+                    if pool.load_into(board, "easy"):
                         ui.log_message(console_messages, "Easy puzzle generated!")
                     else:
                         ui.log_message(console_messages, "Failed to generate puzzle.")
@@ -58,7 +180,7 @@ def main():
                     selected_cell = None
                 elif buttons["medium"].collidepoint(mouse_pos):
                     console_messages.clear()
-                    if board.generate("medium"):
+                    if pool.load_into(board, "medium"):
                         ui.log_message(console_messages, "Medium puzzle generated!")
                     else:
                         ui.log_message(console_messages, "Failed to generate puzzle.")
@@ -68,7 +190,7 @@ def main():
                     selected_cell = None
                 elif buttons["hard"].collidepoint(mouse_pos):
                     console_messages.clear()
-                    if board.generate("hard"):
+                    if pool.load_into(board, "hard"):
                         ui.log_message(console_messages, "Hard puzzle generated!")
                     else:
                         ui.log_message(console_messages, "Failed to generate puzzle.")
@@ -77,21 +199,26 @@ def main():
                     tracker.reset()
                     selected_cell = None
                 elif buttons["solve"].collidepoint(mouse_pos):
-                    if board.solve():
-                        tracker.mark_solver_solved()
-                        ui.log_message(console_messages, "Sudoku solved using solver!")
-                    else:
-                        ui.log_message(console_messages, "No solution found.")
+                    solve_job = start_solver(
+                        board, solve_job, visual_solve, console_messages
+                    )
                 elif buttons["instructions"].collidepoint(mouse_pos):
-                    screen = ui.render_instructions(screen, fonts, theme)
+                    overlay_stack.push(overlays.InstructionsOverlay())
                 elif buttons["leaderboard"].collidepoint(mouse_pos):
-                    entries = scoreboard.get_leaderboard()
-                    screen = ui.render_leaderboard(screen, fonts, theme, entries)
+                    try:
+                        entries = scoreboard.LeaderboardPages(
+                            timeout=config.SCOREBOARD_UI_LOCK_TIMEOUT
+                        )
+                    except (scoreboard.LockTimeout, OSError):
+                        ui.log_message(console_messages, "Leaderboard busy; try again.")
+                    else:
+                        overlay_stack.push(overlays.LeaderboardOverlay(entries))
 
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_t:
                     theme_name = "light" if theme_name == "dark" else "dark"
                     theme = config.THEMES[theme_name]
+                    ui.prepare_theme(fonts, theme)
                     ui.log_message(
                         console_messages, f"Theme set to {theme_name}."
                     )
@@ -108,7 +235,9 @@ def main():
                 ]:
                     row, col = selected_cell
                     value = event.key - pygame.K_0
-                    if board.is_given(row, col):
+                    if visual_solve is not None:
+                        ui.log_message(console_messages, "Solver running. Press Esc to stop.")
+                    elif board.is_given(row, col):
                         ui.log_message(console_messages, "Cell is locked.")
                     elif board.get_value(row, col) != 0:
                         ui.log_message(
@@ -138,7 +267,9 @@ def main():
                 if selected_cell and event.key in [pygame.K_BACKSPACE, pygame.K_0]:
                     row, col = selected_cell
                     previous_value = board.get_value(row, col)
-                    if board.clear_value(row, col):
+                    if visual_solve is not None:
+                        ui.log_message(console_messages, "Solver running. Press Esc to stop.")
+                    elif board.clear_value(row, col):
                         move_count += 1
                         tracker.record_clear(row, col, previous_value)
                         ui.log_message(console_messages, "Cell cleared!")
@@ -146,16 +277,74 @@ def main():
                         ui.log_message(console_messages, "Cell is locked.")
 
                 if event.key == pygame.K_s:
-                    if board.solve():
-                        tracker.mark_solver_solved()
-                        ui.log_message(console_messages, "Sudoku solved using solver!")
+                    solve_job = start_solver(
+                        board, solve_job, visual_solve, console_messages
+                    )
+
+                if event.key == pygame.K_p:
+                    if frame_profiler.toggle():
+                        ui.log_message(console_messages, "Frame profiler on.")
                     else:
-                        ui.log_message(console_messages, "No solution found.")
+                        profile_lines = None
+                        ui.log_message(console_messages, "Frame profiler off.")
+
+                if event.key == pygame.K_x and frame_profiler.frames:
+                    csv_path = frame_profiler.export_csv()
+                    json_path = frame_profiler.export_json()
+                    ui.log_message(
+                        console_messages, f"Profile saved to {csv_path.name} and {json_path.name}."
+                    )
+
+                if event.key == pygame.K_f:
+                    ui.log_message(
+                        console_messages,
+                        f"Frames: {pacer.active_frames} active, {pacer.idle_frames} idle.",
+                    )
+                    log_pool_stats(pool, console_messages)
+
+                if event.key == pygame.K_v:
+                    if solve_job is not None or visual_solve is not None:
+                        ui.log_message(console_messages, "Solver already running.")
+                    else:
+                        visual_solve = board.solve_stepwise()
+                        ui.log_message(console_messages, "Visual solve... (Esc to stop)")
+
+                if event.key == pygame.K_ESCAPE and solve_job is not None:
+                    solve_job.cancel()
+                if event.key == pygame.K_ESCAPE and visual_solve is not None:
+                    visual_solve.cancel()
+                    visual_solve = None
+                    ui.log_message(console_messages, "Visual solve stopped.")
 
-        ui.draw_grid(screen, board, selected_cell, fonts, theme)
-        ui.draw_move_counter(screen, fonts, move_count, tracker.score, theme)
-        ui.draw_console(screen, fonts, console_messages, theme)
-        ui.draw_buttons(screen, fonts, buttons, theme)
+        for overlay in overlay_stack.pop_closed():
+            finish_overlay(overlay_stack, overlay, console_messages)
+        frame_profiler.mark("events")
+
+        if solve_job is not None:
+            if solve_job.poll() is not None:
+                finish_solver(board, solve_job, tracker, console_messages)
+                solve_job = None
+
+        highlight_cell = None
+        if visual_solve is not None:
+            visual_solve.advance(
+                config.VISUAL_SOLVE_FRAME_BUDGET_MS, config.VISUAL_SOLVE_STEPS_PER_FRAME
+            )
+            if visual_solve.last_step is not None:
+                highlight_cell = (visual_solve.last_step.row, visual_solve.last_step.col)
+            if visual_solve.done:
+                finish_visual_solve(visual_solve, tracker, console_messages)
+                visual_solve = None
+                highlight_cell = None
+        frame_profiler.mark("solver")
+
+        if scoreboard.pending() and time.monotonic() >= score_retry_at:
+            score_retry_at = time.monotonic() + config.SCOREBOARD_RETRY_SECONDS
+            retry_pending_scores(console_messages)
+        frame_profiler.mark("scores")
+
+        if pacer.idle:
+            continue
 
         if not win_condition and board.check_win():
             win_condition = True
@@ -166,28 +355,63 @@ def main():
             ui.log_message(console_messages, "Sudoku!")
             ui.log_message(console_messages, "You've completed the")
             ui.log_message(console_messages, "Congratulations!")
-            screen, should_save = ui.prompt_save_score(
-                screen, fonts, theme, tracker.score
-            )
-            if should_save is None:
-                running = False
-                break
-            if should_save:
-                screen, player_name = ui.prompt_player_name(
-                    screen, fonts, theme, tracker.score
-                )
-                if player_name is None:
-                    running = False
-                    break
-                scoreboard.update_score(player_name, tracker.score)
-                ui.log_message(console_messages, f"Score saved for {player_name}.")
-            else:
-                ui.log_message(console_messages, "Score not saved.")
+            overlay_stack.push(overlays.SaveScorePrompt(tracker.score))
             move_count = 0
+        frame_profiler.mark("check_win")
 
-        pygame.display.flip()
-        clock.tick(60)
+        hovered = None
+        if not overlay_stack:
+            hovered = ui.get_hovered_button(buttons, pygame.mouse.get_pos())
+        progress = visual_solve.progress if visual_solve is not None else None
+        if config.DIRTY_RECT_RENDERING:
+            dirty = renderer.render(
+                screen,
+                board,
+                fonts,
+                buttons,
+                theme,
+                selected_cell,
+                highlight_cell,
+                move_count,
+                tracker.score,
+                progress,
+                console_messages,
+                hovered,
+                overlay_stack,
+                profile_lines,
+                frame_profiler,
+            )
+            if dirty:
+                pygame.display.update(dirty)
+        else:
+            ui.draw_background(screen, fonts, buttons, theme)
+            frame_profiler.mark("background")
+            ui.draw_grid(screen, board, selected_cell, fonts, theme, highlight_cell)
+            ui.draw_move_counter(screen, fonts, move_count, tracker.score, theme)
+            if progress is not None:
+                ui.draw_solver_progress(screen, fonts, progress, theme)
+            frame_profiler.mark("grid")
+            ui.draw_console(screen, fonts, console_messages, theme)
+            frame_profiler.mark("console")
+            ui.draw_button_hover(screen, buttons, hovered, theme)
+            if profile_lines:
+                ui.draw_profiler(screen, fonts, profile_lines, theme)
+            overlay_stack.draw(screen, fonts, theme)
+            frame_profiler.mark("buttons")
+            pygame.display.flip()
+        frame_profiler.mark("present")
+        if frame_profiler.hud_due():
+            profile_lines = frame_profiler.hud_lines()
+            frame_profiler.mark("hud")
+        frame_profiler.end_frame()
 
+    if solve_job is not None:
+        solve_job.cancel()
+    pool.stop()
+    try:
+        scoreboard.flush()
+    except (scoreboard.LockTimeout, OSError) as error:
+        print(f"Could not save {scoreboard.pending()} pending score(s): {error}", file=sys.stderr)
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,413 @@
+import pygame
+
+import config
+import scoreboard
+from ui import draw_panel, draw_shadow, render_text, wrap_text
+
+INSTRUCTIONS = [
+    "Welcome to Sudoku!",
+    "1. Click on a cell to select it.",
+    "2. Type a number 1 through 9 on your keyboard to place it in the cell.",
+    "3. To delete a number from a cell, press backspace or 0.",
+    "4. Cells with darker numbers are given clues and cannot be edited.",
+    "5. Use the Solver button to solve the board automatically.",
+    "6. Use the Easy, Medium, or Hard buttons to start a new game.",
+    "7. To win, fill the board correctly with numbers 1 through 9.",
+    "8. View the leaderboard using the Leaderboard button.",
+    "9. Your score is saved after completing a puzzle.",
+    "Press T to toggle the theme.",
+    "Press V to watch the solver work step by step.",
+    "Press F to log active and idle frame counts.",
+    "Press P to toggle the frame profiler and X to export it.",
+    "Press ESC in the game to cancel a running solver.",
+    "Press ESC to return to the game.",
+]
+
+
+def centered_rect(width, height):
+    rect = pygame.Rect(0, 0, width, height)
+    rect.center = (config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2)
+    return rect
+
+
+class Overlay:
+    def __init__(self, width, height):
+        self.rect = centered_rect(width, height)
+        self.closed = False
+        self.result = None
+
+    def close(self, result=None):
+        self.closed = True
+        self.result = result
+        return True
+
+    def handle_event(self, event):
+        return False
+
+    def draw(self, screen, fonts, theme):
+        draw_shadow(
+            screen,
+            self.rect,
+            theme["shadow"],
+            config.PANEL_SHADOW_OFFSET,
+            config.PANEL_RADIUS,
+        )
+        draw_panel(
+            screen,
+            self.rect,
+            theme["panel"],
+            theme["panel_border"],
+            config.PANEL_RADIUS,
+        )
+
+
+class InstructionsOverlay(Overlay):
+    def __init__(self):
+        super().__init__(config.INSTRUCTIONS_WIDTH, config.INSTRUCTIONS_HEIGHT)
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            return self.close()
+        return False
+
+    def draw(self, screen, fonts, theme):
+        super().draw(screen, fonts, theme)
+        y_offset = self.rect.y + 20
+        for line in INSTRUCTIONS:
+            text_surface = render_text(fonts["console"], line, theme["text"])
+            screen.blit(text_surface, (self.rect.x + 20, y_offset))
+            y_offset += 40
+
+
+class SaveScorePrompt(Overlay):
+    def __init__(self, score):
+        super().__init__(config.NAME_PROMPT_WIDTH, config.NAME_PROMPT_HEIGHT)
+        self.score = score
+
+    def handle_event(self, event):
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key in (pygame.K_y, pygame.K_RETURN):
+            return self.close(True)
+        if event.key in (pygame.K_n, pygame.K_ESCAPE):
+            return self.close(False)
+        return False
+
+    def draw(self, screen, fonts, theme):
+        super().draw(screen, fonts, theme)
+        panel_rect = self.rect
+
+        title = render_text(fonts["console"], "Save your score?", theme["text"])
+        screen.blit(title, (panel_rect.x + 20, panel_rect.y + 20))
+
+        score_text = render_text(fonts["counter"], f"Score: {self.score}", theme["muted_text"])
+        screen.blit(score_text, (panel_rect.x + 20, panel_rect.y + 70))
+
+        info_lines = [
+            "Press Y to save to the leaderboard.",
+            "Press N to skip.",
+        ]
+        for index, line in enumerate(info_lines):
+            info_surface = render_text(fonts["counter"], line, theme["muted_text"])
+            screen.blit(info_surface, (panel_rect.x + 20, panel_rect.y + 120 + index * 28))
+
+
+class NamePrompt(Overlay):
+    def __init__(self, score):
+        super().__init__(config.NAME_PROMPT_WIDTH, config.NAME_PROMPT_HEIGHT)
+        self.score = score
+        self.input_text = ""
+        self.error_message = ""
+        self.input_rect = pygame.Rect(
+            self.rect.x + 20,
+            self.rect.y + 110,
+            self.rect.width - 40,
+            44,
+        )
+
+    def handle_event(self, event):
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == pygame.K_ESCAPE:
+            return self.close(None)
+        if event.key == pygame.K_RETURN:
+            candidate = self.input_text.strip()
+            self.error_message = scoreboard.validate_name(candidate)
+            if not self.error_message:
+                return self.close(candidate)
+            self.input_text = candidate
+            return True
+        if event.key == pygame.K_BACKSPACE:
+            self.input_text = self.input_text[:-1]
+            return True
+        if (
+            event.unicode
+            and len(self.input_text) < config.NAME_MAX_LENGTH
+            and event.unicode in scoreboard.ALLOWED_NAME_CHARS
+        ):
+            self.input_text += event.unicode
+            return True
+        return False
+
+    def draw(self, screen, fonts, theme):
+        super().draw(screen, fonts, theme)
+        panel_rect = self.rect
+        input_rect = self.input_rect
+
+        title = render_text(fonts["console"], "Save your score", theme["text"])
+        screen.blit(title, (panel_rect.x + 20, panel_rect.y + 20))
+
+        score_text = render_text(fonts["counter"], f"Score: {self.score}", theme["muted_text"])
+        screen.blit(score_text, (panel_rect.x + 20, panel_rect.y + 60))
+
+        hint = f"Name (max {config.NAME_MAX_LENGTH}):"
+        hint_text = render_text(fonts["counter"], hint, theme["muted_text"])
+        screen.blit(hint_text, (input_rect.x, input_rect.y - 28))
+
+        pygame.draw.rect(screen, theme["grid_bg"], input_rect, border_radius=8)
+        pygame.draw.rect(screen, theme["panel_border"], input_rect, 2, border_radius=8)
+
+        display_text = self.input_text or " "
+        text_surface = render_text(fonts["console"], display_text, theme["text"])
+        screen.blit(text_surface, (input_rect.x + 10, input_rect.y + 6))
+
+        if self.error_message:
+            error_lines = wrap_text(fonts["counter"], self.error_message, panel_rect.width - 40)
+            for index, line in enumerate(error_lines):
+                error_surface = render_text(fonts["counter"], line, theme["given_text"])
+                screen.blit(
+                    error_surface,
+                    (panel_rect.x + 20, input_rect.bottom + 12 + index * 22),
+                )
+        else:
+            help_text = "Press Enter to save, Esc to skip."
+            help_surface = render_text(fonts["counter"], help_text, theme["muted_text"])
+            screen.blit(help_surface, (panel_rect.x + 20, input_rect.bottom + 14))
+
+
+class LeaderboardOverlay(Overlay):
+    def __init__(self, entries, visible_rows=config.LEADERBOARD_MAX_ENTRIES):
+        super().__init__(config.LEADERBOARD_WIDTH, config.LEADERBOARD_HEIGHT)
+        self.entries = entries
+        self.visible_rows = visible_rows
+        self.top = 0
+        self.highlight = None
+        self.query = None
+        self.message = ""
+        self._rows = {}
+
+    def scroll_to(self, top):
+        top = max(0, min(top, len(self.entries) - self.visible_rows))
+        if top == self.top:
+            return False
+        self.top = top
+        return True
+
+    def scroll(self, rows):
+        return self.scroll_to(self.top + rows)
+
+    def find(self, name):
+        if hasattr(self.entries, "find"):
+            return self.entries.find(name)
+        key = name.lower()
+        for index, entry in enumerate(self.entries):
+            if entry["name"].lower() == key:
+                return index
+        return None
+
+    def jump_to(self, name):
+        rank = self.find(name) if name else None
+        entry = self.entries[rank] if rank is not None and rank < len(self.entries) else None
+        if entry is None or entry["name"].lower() != name.lower():
+            self.highlight = None
+            self.message = f"No player named {name}." if name else ""
+            self.scroll_to(self.top)
+            return True
+        self.highlight = rank
+        self.scroll_to(rank - self.visible_rows // 2)
+        self.message = f"{entry['name']} is rank {rank + 1}."
+        return True
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEWHEEL:
+            return self.scroll(-event.y * config.LEADERBOARD_SCROLL_ROWS)
+        if event.type != pygame.KEYDOWN:
+            return False
+        if self.query is not None:
+            return self._handle_search_key(event)
+        if event.key == pygame.K_ESCAPE:
+            return self.close()
+        if event.key == pygame.K_SLASH or event.unicode == "/":
+            self.query = ""
+            return True
+        steps = {
+            pygame.K_UP: -1,
+            pygame.K_DOWN: 1,
+            pygame.K_PAGEUP: -self.visible_rows,
+            pygame.K_PAGEDOWN: self.visible_rows,
+        }
+        if event.key in steps:
+            return self.scroll(steps[event.key])
+        if event.key == pygame.K_HOME:
+            return self.scroll_to(0)
+        if event.key == pygame.K_END:
+            return self.scroll_to(len(self.entries))
+        return False
+
+    def _handle_search_key(self, event):
+        if event.key == pygame.K_ESCAPE:
+            self.query = None
+            return True
+        if event.key == pygame.K_RETURN:
+            query, self.query = self.query.strip(), None
+            return self.jump_to(query)
+        if event.key == pygame.K_BACKSPACE:
+            self.query = self.query[:-1]
+            return True
+        if (
+            event.unicode
+            and len(self.query) < config.NAME_MAX_LENGTH
+            and event.unicode in scoreboard.ALLOWED_NAME_CHARS
+        ):
+            self.query += event.unicode
+            return True
+        return False
+
+    def _row_surface(self, index, entry, font, theme, columns):
+        key = (entry["name"], entry["score"], theme["text"], theme["panel"])
+        cached = self._rows.get(index)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        surface = pygame.Surface((columns[-1], font.get_linesize()))
+        surface.fill(theme["panel"])
+        texts = (str(index + 1), entry["name"], str(entry["score"]))
+        for text, x_pos in zip(texts, columns):
+            surface.blit(font.render(text, True, theme["text"]), (x_pos, 0))
+        self._rows[index] = (key, surface)
+        return surface
+
+    def _prune_rows(self):
+        window = self.visible_rows * config.LEADERBOARD_ROW_CACHE_PAGES
+        if len(self._rows) <= self.visible_rows + 2 * window:
+            return
+        low, high = self.top - window, self.top + self.visible_rows + window
+        self._rows = {index: row for index, row in self._rows.items() if low <= index < high}
+
+    def draw(self, screen, fonts, theme):
+        super().draw(screen, fonts, theme)
+        panel_rect = self.rect
+        line_height = fonts["console"].get_linesize()
+        row_font = fonts["counter"]
+
+        header_y = panel_rect.y + 20
+        title = render_text(fonts["console"], "Leaderboard", theme["text"])
+        screen.blit(title, (panel_rect.x + 20, header_y))
+
+        col_rank = panel_rect.x + 20
+        col_name = panel_rect.x + 90
+        col_score = panel_rect.right - 120
+        columns = (0, col_name - col_rank, col_score - col_rank, panel_rect.width - 60)
+        header_y += line_height + 10
+
+        header_rank = render_text(row_font, "Rank", theme["muted_text"])
+        header_name = render_text(row_font, "Player", theme["muted_text"])
+        header_score = render_text(row_font, "Score", theme["muted_text"])
+        screen.blit(header_rank, (col_rank, header_y))
+        screen.blit(header_name, (col_name, header_y))
+        screen.blit(header_score, (col_score, header_y))
+
+        content_y = header_y + line_height + 8
+        row_height = line_height + 6
+        total = len(self.entries)
+        shown = 0
+        if not total:
+            empty_text = render_text(
+                row_font, "No scores yet. Finish a puzzle to add one!", theme["muted_text"]
+            )
+            screen.blit(empty_text, (panel_rect.x + 20, content_y))
+        else:
+            for offset in range(min(self.visible_rows, total - self.top)):
+                index = self.top + offset
+                entry = self.entries[index]
+                if entry is None:
+                    break
+                y_pos = content_y + offset * row_height
+                row_surface = self._row_surface(index, entry, row_font, theme, columns)
+                screen.blit(row_surface, (col_rank, y_pos))
+                if index == self.highlight:
+                    highlight_rect = pygame.Rect(
+                        col_rank - 8, y_pos - 3, columns[-1] + 16, row_font.get_linesize() + 6
+                    )
+                    pygame.draw.rect(screen, theme["selected"], highlight_rect, 2, border_radius=6)
+                shown += 1
+            self._prune_rows()
+
+        if total > self.visible_rows:
+            track = pygame.Rect(
+                panel_rect.right - 24, content_y, 6, self.visible_rows * row_height - 6
+            )
+            thumb_height = max(12, track.height * self.visible_rows // total)
+            thumb_y = track.y + (track.height - thumb_height) * self.top // (
+                total - self.visible_rows
+            )
+            pygame.draw.rect(screen, theme["grid_bg"], track, border_radius=3)
+            thumb = pygame.Rect(track.x, thumb_y, track.width, thumb_height)
+            pygame.draw.rect(screen, theme["panel_border"], thumb, border_radius=3)
+
+        if self.query is not None:
+            status = f"Find player: {self.query}_"
+        elif self.message:
+            status = self.message
+        elif shown:
+            status = f"Rows {self.top + 1}-{self.top + shown} of {total}"
+        else:
+            status = ""
+        footer_text = render_text(
+            row_font,
+            "Arrows, PgUp/PgDn or wheel to scroll. / to find a player. ESC to return.",
+            theme["muted_text"],
+        )
+        footer_y = panel_rect.bottom - footer_text.get_height() - 14
+        if status:
+            status_text = row_font.render(status, True, theme["text"])
+            screen.blit(status_text, (panel_rect.x + 20, footer_y - status_text.get_height() - 6))
+        screen.blit(footer_text, (panel_rect.x + 20, footer_y))
+
+
+class OverlayStack:
+    def __init__(self):
+        self._overlays = []
+        self.version = 0
+
+    def __len__(self):
+        return len(self._overlays)
+
+    def __bool__(self):
+        return bool(self._overlays)
+
+    def top(self):
+        return self._overlays[-1] if self._overlays else None
+
+    def push(self, overlay):
+        self._overlays.append(overlay)
+        self.version += 1
+
+    def handle_event(self, event):
+        for overlay in reversed(self._overlays):
+            if overlay.closed:
+                continue
+            if overlay.handle_event(event):
+                self.version += 1
+            return True
+        return False
+
+    def pop_closed(self):
+        closed = [overlay for overlay in self._overlays if overlay.closed]
+        if closed:
+            self._overlays = [overlay for overlay in self._overlays if not overlay.closed]
+            self.version += 1
+        return closed
+
+    def draw(self, screen, fonts, theme):
+        for overlay in self._overlays:
+            overlay.draw(screen, fonts, theme)
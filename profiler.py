@@ -0,0 +1,135 @@
+import csv
+import heapq
+import json
+import math
+import time
+from collections import deque
+from pathlib import Path
+
+import config
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values, percent):
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[min(len(sorted_values), max(rank, 1)) - 1]
+
+
+def export_path(suffix):
+    return Path(__file__).with_name(config.PROFILER_EXPORT_NAME + suffix)
+
+
+class FrameProfiler:
+    def __init__(
+        self,
+        window=config.PROFILER_WINDOW,
+        worst_count=config.PROFILER_WORST_FRAMES,
+        enabled=False,
+        clock=time.perf_counter,
+    ):
+        self.enabled = enabled
+        self.clock = clock
+        self.worst_count = worst_count
+        self.frames = deque(maxlen=window)
+        self.frame_count = 0
+        self._worst = []
+        self._stages = []
+        self._current = None
+        self._start = 0
+        self._mark = 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self._current = None
+        return self.enabled
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._start = self._mark = self.clock()
+        self._current = {}
+
+    def mark(self, stage):
+        if self._current is None:
+            return
+        now = self.clock()
+        self._current[stage] = self._current.get(stage, 0.0) + (now - self._mark) * 1000
+        self._mark = now
+        if stage not in self._stages:
+            self._stages.append(stage)
+
+    def end_frame(self):
+        if self._current is None:
+            return
+        total = (self.clock() - self._start) * 1000
+        frame = (self.frame_count, total, self._current)
+        self.frames.append(frame)
+        self.frame_count += 1
+        if len(self._worst) < self.worst_count:
+            heapq.heappush(self._worst, (total, frame[0], self._current))
+        elif total > self._worst[0][0]:
+            heapq.heapreplace(self._worst, (total, frame[0], self._current))
+        self._current = None
+
+    def hud_due(self, interval=config.PROFILER_HUD_INTERVAL):
+        return self.enabled and self.frame_count % interval == 0
+
+    def stages(self):
+        return list(self._stages)
+
+    def summary(self):
+        columns = {"total": sorted(frame[1] for frame in self.frames)}
+        for stage in self._stages:
+            columns[stage] = sorted(frame[2].get(stage, 0.0) for frame in self.frames)
+        summary = {}
+        for name, values in columns.items():
+            row = {f"p{percent}": percentile(values, percent) for percent in PERCENTILES}
+            row["max"] = values[-1] if values else 0.0
+            summary[name] = row
+        return summary
+
+    def worst_frames(self):
+        return [
+            {"frame": index, "total": total, "stages": dict(stages)}
+            for total, index, stages in sorted(self._worst, reverse=True)
+        ]
+
+    def hud_lines(self):
+        lines = [f"Frame profile ({len(self.frames)} frames, ms)"]
+        for name, row in self.summary().items():
+            lines.append(
+                f"{name}: p50 {row['p50']:.2f}  p95 {row['p95']:.2f}  "
+                f"p99 {row['p99']:.2f}  max {row['max']:.2f}"
+            )
+        return lines
+
+    def export_csv(self, path=None):
+        path = Path(path) if path else export_path(".csv")
+        with path.open("w", newline="", encoding="utf-8") as file_handle:
+            writer = csv.writer(file_handle)
+            writer.writerow(["frame", "total"] + self._stages)
+            for index, total, stages in self.frames:
+                writer.writerow(
+                    [index, f"{total:.4f}"]
+                    + [f"{stages.get(stage, 0.0):.4f}" for stage in self._stages]
+                )
+        return path
+
+    def export_json(self, path=None):
+        path = Path(path) if path else export_path(".json")
+        data = {
+            "frames": len(self.frames),
+            "stages": self._stages,
+            "summary": self.summary(),
+            "worst_frames": self.worst_frames(),
+            "samples": [
+                {"frame": index, "total": total, "stages": stages}
+                for index, total, stages in self.frames
+            ],
+        }
+        with path.open("w", encoding="utf-8") as file_handle:
+            json.dump(data, file_handle, indent=2)
+        return path
@@ -0,0 +1,100 @@
+import random
+from pathlib import Path
+
+import config
+
+MAGIC = b"SDKB\x01"
+PACKED_GRID_SIZE = 41
+RECORD_SIZE = 1 + 2 * PACKED_GRID_SIZE
+
+
+def bank_path():
+    return Path(__file__).with_name(config.PUZZLE_BANK_FILE)
+
+
+def pack_grid(grid):
+    padded = list(grid) + [0]
+    return bytes((padded[index] << 4) | padded[index + 1] for index in range(0, 81, 2))
+
+
+def unpack_grid(data):
+    grid = []
+    for byte in data:
+        grid.append(byte >> 4)
+        grid.append(byte & 0x0F)
+    return grid[:81]
+
+
+def pack_record(difficulty, grid, solution):
+    index = config.DIFFICULTIES.index(difficulty)
+    return bytes((index,)) + pack_grid(grid) + pack_grid(solution)
+
+
+class BankWriter:
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = None
+        self.written = 0
+
+    def __enter__(self):
+        self._file = self.path.open("wb")
+        self._file.write(MAGIC)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._file.close()
+        self._file = None
+
+    def write(self, difficulty, grid, solution):
+        self._file.write(pack_record(difficulty, grid, solution))
+        self.written += 1
+
+    def write_records(self, records):
+        self._file.write(b"".join(records))
+        self.written += len(records)
+
+
+class PuzzleBank:
+    def __init__(self, data, rng=None):
+        if not data.startswith(MAGIC):
+            raise ValueError("Not a puzzle bank file")
+        self._data = data
+        self._rng = rng if rng is not None else random.Random()
+        self._offsets = {difficulty: [] for difficulty in config.DIFFICULTIES}
+        self._cursor = {difficulty: 0 for difficulty in config.DIFFICULTIES}
+        for offset in range(len(MAGIC), len(data) - RECORD_SIZE + 1, RECORD_SIZE):
+            index = data[offset]
+            if index < len(config.DIFFICULTIES):
+                self._offsets[config.DIFFICULTIES[index]].append(offset)
+        for offsets in self._offsets.values():
+            self._rng.shuffle(offsets)
+
+    @classmethod
+    def load(cls, path=None, rng=None):
+        path = Path(path) if path is not None else bank_path()
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            return cls(data, rng)
+        except ValueError:
+            return None
+
+    def count(self, difficulty):
+        return len(self._offsets.get(difficulty, ()))
+
+    def draw(self, difficulty):
+        offsets = self._offsets.get(difficulty)
+        if not offsets:
+            return None
+        cursor = self._cursor[difficulty]
+        if cursor >= len(offsets):
+            self._rng.shuffle(offsets)
+            cursor = 0
+        self._cursor[difficulty] = cursor + 1
+        offset = offsets[cursor] + 1
+        grid = unpack_grid(self._data[offset:offset + PACKED_GRID_SIZE])
+        offset += PACKED_GRID_SIZE
+        solution = unpack_grid(self._data[offset:offset + PACKED_GRID_SIZE])
+        return grid, solution
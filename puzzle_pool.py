@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import deque
+
+import config
+from sudoku import SudokuBoard
+
+
+class PuzzlePool:
+    def __init__(
+        self,
+        size=config.PUZZLE_POOL_SIZE,
+        difficulties=config.DIFFICULTIES,
+        unique=config.UNIQUE_PUZZLES,
+        bank=None,
+    ):
+        self.size = size
+        self.unique = unique
+        self.bank = bank
+        self._ready = {difficulty: deque() for difficulty in difficulties}
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._running = False
+        self._thread = None
+        self.hits = 0
+        self.misses = 0
+        self.bank_draws = 0
+        self.refills = 0
+        self.refill_seconds = 0.0
+        self.last_refill_seconds = 0.0
+
+    def start(self):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="puzzle-pool", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            self._running = False
+            self._wake.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _next_difficulty(self):
+        difficulty = min(self._ready, key=lambda key: len(self._ready[key]))
+        if len(self._ready[difficulty]) >= self.size:
+            return None
+        return difficulty
+
+    def _run(self):
+        board = SudokuBoard()
+        while True:
+            with self._lock:
+                difficulty = self._next_difficulty()
+                while self._running and difficulty is None:
+                    self._wake.wait()
+                    difficulty = self._next_difficulty()
+                if not self._running:
+                    return
+
+            started = time.perf_counter()
+            puzzle = self._draw_from_bank(difficulty)
+            if puzzle is None:
+                if not board.generate(difficulty, unique=self.unique):
+                    continue
+                puzzle = (board.to_grid(), board.solution_grid())
+            elapsed = time.perf_counter() - started
+
+            with self._lock:
+                self._ready[difficulty].append(puzzle)
+                self.refills += 1
+                self.refill_seconds += elapsed
+                self.last_refill_seconds = elapsed
+                self._wake.notify_all()
+
+    def _draw_from_bank(self, difficulty):
+        if self.bank is None:
+            return None
+        with self._lock:
+            puzzle = self.bank.draw(difficulty)
+            if puzzle is not None:
+                self.bank_draws += 1
+        return puzzle
+
+    def take(self, difficulty):
+        with self._lock:
+            ready = self._ready.get(difficulty)
+            puzzle = ready.popleft() if ready else None
+            if puzzle is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            self._wake.notify_all()
+        return puzzle
+
+    def load_into(self, board, difficulty):
+        puzzle = self.take(difficulty)
+        if puzzle is None:
+            puzzle = self._draw_from_bank(difficulty)
+        if puzzle is None:
+            return board.generate(difficulty, unique=self.unique)
+        board.load_puzzle(*puzzle)
+        return True
+
+    def wait_until_full(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while self._next_difficulty() is not None:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._wake.wait(remaining)
+        return True
+
+    def ready_count(self, difficulty):
+        with self._lock:
+            return len(self._ready.get(difficulty, ()))
+
+    def stats(self):
+        with self._lock:
+            average = self.refill_seconds / self.refills if self.refills else 0.0
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bank_draws": self.bank_draws,
+                "refills": self.refills,
+                "average_refill_ms": average * 1000,
+                "last_refill_ms": self.last_refill_seconds * 1000,
+                "ready": {key: len(queue) for key, queue in self._ready.items()},
+            }
@@ -0,0 +1,89 @@
+import sqlite3
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    key TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_rank ON scores (score DESC, key);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+UPSERT = (
+    "INSERT INTO scores (key, name, score) VALUES (?, ?, ?) "
+    "ON CONFLICT (key) DO UPDATE SET name = excluded.name, score = excluded.score"
+)
+
+
+class ScoreDatabase:
+    def __init__(self, path, timeout=5.0):
+        self.path = Path(path)
+        self.connection = sqlite3.connect(self.path, timeout=timeout)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def set_timeout(self, timeout):
+        self.connection.execute(f"PRAGMA busy_timeout = {int(timeout * 1000)}")
+
+    def count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def load(self):
+        rows = self.connection.execute("SELECT name, score FROM scores ORDER BY rowid")
+        return [{"name": name, "score": score} for name, score in rows]
+
+    def upsert(self, name, score):
+        with self.connection:
+            self.connection.execute(UPSERT, (name.lower(), name, score))
+
+    def upsert_many(self, entries):
+        with self.connection:
+            self.connection.executemany(
+                UPSERT,
+                ((entry["name"].lower(), entry["name"], entry["score"]) for entry in entries),
+            )
+
+    def top(self, limit=None, offset=0):
+        rows = self.connection.execute(
+            "SELECT name, score FROM scores ORDER BY score DESC, key LIMIT ? OFFSET ?",
+            (-1 if limit is None else limit, offset),
+        )
+        return [{"name": name, "score": score} for name, score in rows]
+
+    def rank(self, name):
+        key = name.lower()
+        row = self.connection.execute("SELECT score FROM scores WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return self.connection.execute(
+            "SELECT (SELECT COUNT(*) FROM scores WHERE score > ?)"
+            " + (SELECT COUNT(*) FROM scores WHERE score = ? AND key < ?)",
+            (row[0], row[0], key),
+        ).fetchone()[0]
+
+    def migrated(self):
+        row = self.connection.execute("SELECT value FROM meta WHERE name = 'migrated'")
+        return row.fetchone() is not None
+
+    def migrate(self, entries):
+        if self.migrated():
+            return 0
+        entries = list(entries)
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO scores (key, name, score) VALUES (?, ?, ?)",
+                ((entry["name"].lower(), entry["name"], entry["score"]) for entry in entries),
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('migrated', '1')"
+            )
+        return len(entries)
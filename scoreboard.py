@@ -1,18 +1,127 @@
+import bisect
 import json
+import os
+import random
+import sqlite3
 import string
+import time
 from pathlib import Path
 
 import config
+from score_db import ScoreDatabase
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 ALLOWED_NAME_CHARS = set(string.ascii_letters + string.digits + " _-")
+BACKENDS = ("journal", "sqlite")
+
+_databases = {}
+_pending = {}
 
 
 def _score_path():
     return Path(__file__).with_name(config.SCOREBOARD_FILE)
 
 
-def load_scores():
+def _journal_path():
     path = _score_path()
+    return path.with_name(path.name + config.SCOREBOARD_JOURNAL_SUFFIX)
+
+
+def _lock_path():
+    path = _score_path()
+    return path.with_name(path.name + ".lock")
+
+
+class LockTimeout(Exception):
+    pass
+
+
+class FileLock:
+    def __init__(self, path, exclusive=True, timeout=None):
+        self.path = Path(path)
+        self.exclusive = exclusive
+        self.timeout = config.SCOREBOARD_LOCK_TIMEOUT if timeout is None else timeout
+        self.retries = 0
+        self._file = None
+
+    def __enter__(self):
+        self._file = self.path.open("a+b")
+        if fcntl is None:
+            return self
+        operation = (fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB
+        delay = config.SCOREBOARD_LOCK_RETRY_MS / 1000
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fcntl.flock(self._file.fileno(), operation)
+                return self
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    self._file.close()
+                    raise LockTimeout(f"Timed out waiting for {self.path}") from None
+            self.retries += 1
+            time.sleep(delay * random.uniform(0.5, 1.0))
+            delay = min(delay * 2, config.SCOREBOARD_LOCK_MAX_RETRY_MS / 1000)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._file.close()
+        self._file = None
+
+
+def _db_path():
+    return Path(__file__).with_name(config.SCOREBOARD_DB_FILE)
+
+
+def _use_database():
+    if config.SCOREBOARD_BACKEND not in BACKENDS:
+        raise ValueError(f"Unknown scoreboard backend: {config.SCOREBOARD_BACKEND}")
+    return config.SCOREBOARD_BACKEND == "sqlite"
+
+
+def _database(timeout=None):
+    timeout = config.SCOREBOARD_LOCK_TIMEOUT if timeout is None else timeout
+    path = _db_path()
+    database = _databases.get(path)
+    if database is None:
+        database = ScoreDatabase(path, timeout)
+        if not database.migrated():
+            with FileLock(_lock_path(), exclusive=False, timeout=timeout):
+                database.migrate(_load_journal_scores())
+        _databases[path] = database
+    else:
+        database.set_timeout(timeout)
+    return database
+
+
+def _query(method, *args, timeout=None):
+    try:
+        return method(_database(timeout), *args)
+    except sqlite3.OperationalError as error:
+        if "locked" not in str(error):
+            raise
+        raise LockTimeout(f"Timed out waiting for {_db_path()}") from error
+
+
+def close_databases():
+    while _databases:
+        _databases.popitem()[1].close()
+
+
+def _clean_entry(entry):
+    if not isinstance(entry, dict):
+        return None
+    name = entry.get("name")
+    score = entry.get("score")
+    if isinstance(name, str) and isinstance(score, int):
+        return {"name": name, "score": score}
+    return None
+
+
+def _load_snapshot(path):
     if not path.exists():
         return []
     try:
@@ -22,40 +131,352 @@ def load_scores():
         return []
     if not isinstance(data, list):
         return []
-    cleaned = []
-    for entry in data:
-        if not isinstance(entry, dict):
-            continue
-        name = entry.get("name")
-        score = entry.get("score")
-        if isinstance(name, str) and isinstance(score, int):
-            cleaned.append({"name": name, "score": score})
-    return cleaned
+    return [entry for entry in map(_clean_entry, data) if entry is not None]
 
 
-def save_scores(entries):
+def _replay_journal(path, entries):
+    if not path.exists():
+        return
+    with path.open("rb") as file_handle:
+        for line in file_handle:
+            try:
+                entry = _clean_entry(json.loads(line))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                continue
+            if entry is not None:
+                entries[entry["name"].lower()] = entry
+
+
+def _read_journal_entries():
+    entries = {}
+    for entry in _load_snapshot(_score_path()):
+        entries[entry["name"].lower()] = entry
+    _replay_journal(_journal_path(), entries)
+    return entries
+
+
+def _load_journal_scores():
+    return list(_read_journal_entries().values())
+
+
+class SortedRanking:
+    def __init__(self, items=(), bucket_size=None):
+        self.bucket_size = bucket_size or config.LEADERBOARD_BUCKET_SIZE
+        items = sorted(items)
+        size = self.bucket_size
+        self._buckets = [items[start:start + size] for start in range(0, len(items), size)]
+        self._len = len(items)
+        self._rebuild()
+
+    def _rebuild(self):
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        tree = [0] * (len(self._buckets) + 1)
+        for index, bucket in enumerate(self._buckets, 1):
+            tree[index] += len(bucket)
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        self._tree = tree
+
+    def _grow(self, bucket, delta):
+        self._len += delta
+        index = bucket + 1
+        while index < len(self._tree):
+            self._tree[index] += delta
+            index += index & -index
+
+    def _before(self, bucket):
+        total = 0
+        while bucket:
+            total += self._tree[bucket]
+            bucket -= bucket & -bucket
+        return total
+
+    def _locate(self, position):
+        bucket = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            following = bucket + step
+            if following < len(self._tree) and self._tree[following] <= position:
+                bucket = following
+                position -= self._tree[following]
+            step >>= 1
+        return bucket, position
+
+    def __len__(self):
+        return self._len
+
+    def add(self, item):
+        if not self._buckets:
+            self._buckets.append([item])
+            self._len = 1
+            self._rebuild()
+            return
+        index = min(bisect.bisect_left(self._maxes, item), len(self._buckets) - 1)
+        bucket = self._buckets[index]
+        bisect.insort(bucket, item)
+        self._maxes[index] = bucket[-1]
+        self._grow(index, 1)
+        if len(bucket) > 2 * self.bucket_size:
+            self._buckets[index:index + 1] = [bucket[:self.bucket_size], bucket[self.bucket_size:]]
+            self._rebuild()
+
+    def remove(self, item):
+        index = bisect.bisect_left(self._maxes, item)
+        bucket = self._buckets[index]
+        del bucket[bisect.bisect_left(bucket, item)]
+        self._grow(index, -1)
+        if bucket:
+            self._maxes[index] = bucket[-1]
+        else:
+            del self._buckets[index]
+            self._rebuild()
+
+    def index(self, item):
+        bucket = bisect.bisect_left(self._maxes, item)
+        if bucket == len(self._buckets):
+            return self._len
+        return self._before(bucket) + bisect.bisect_left(self._buckets[bucket], item)
+
+    def slice(self, start, stop=None):
+        stop = self._len if stop is None else min(stop, self._len)
+        if start >= stop:
+            return []
+        bucket, offset = self._locate(start)
+        items = []
+        while len(items) < stop - start:
+            items.extend(self._buckets[bucket][offset:offset + stop - start - len(items)])
+            bucket += 1
+            offset = 0
+        return items
+
+
+class LeaderboardCache:
+    def __init__(self):
+        self.signature = None
+        self.entries = {}
+        self.ranking = SortedRanking()
+
+    def invalidate(self):
+        self.signature = None
+
+    def load(self, signature, entries):
+        self.entries = entries
+        self.ranking = SortedRanking((-entry["score"], key) for key, entry in entries.items())
+        self.signature = signature
+
+    def apply(self, entry):
+        key = entry["name"].lower()
+        previous = self.entries.get(key)
+        if previous is not None:
+            self.ranking.remove((-previous["score"], key))
+        self.entries[key] = entry
+        self.ranking.add((-entry["score"], key))
+
+    def page(self, offset=0, limit=None):
+        end = None if limit is None else offset + limit
+        return [dict(self.entries[key]) for _, key in self.ranking.slice(offset, end)]
+
+    def rank(self, name):
+        key = name.lower()
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        return self.ranking.index((-entry["score"], key))
+
+
+_cache = LeaderboardCache()
+
+
+def _file_signature(path):
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _signature():
     path = _score_path()
-    with path.open("w", encoding="utf-8") as file_handle:
+    return (path, _file_signature(path), _file_signature(_journal_path()))
+
+
+def _refresh():
+    signature = _signature()
+    if signature != _cache.signature:
+        _cache.load(signature, _read_journal_entries())
+    return _cache
+
+
+def _cached(timeout=None):
+    if _signature() != _cache.signature:
+        with FileLock(_lock_path(), exclusive=False, timeout=timeout):
+            _refresh()
+    return _cache
+
+
+def load_scores():
+    flush()
+    if _use_database():
+        return _query(ScoreDatabase.load)
+    return [dict(entry) for entry in _cached().entries.values()]
+
+
+def _fsync_dir(path):
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_snapshot(entries):
+    path = _score_path()
+    temp_path = path.with_name(path.name + ".tmp")
+    with temp_path.open("w", encoding="utf-8") as file_handle:
         json.dump(entries, file_handle, indent=2)
+        file_handle.flush()
+        os.fsync(file_handle.fileno())
+    os.replace(temp_path, path)
+    _fsync_dir(path.parent)
+    journal = _journal_path()
+    if journal.exists():
+        with journal.open("r+b") as file_handle:
+            file_handle.truncate(0)
+            os.fsync(file_handle.fileno())
 
 
-def update_score(name, score):
-    normalized = name.lower()
-    entries = load_scores()
-    for entry in entries:
-        if entry["name"].lower() == normalized:
-            entry["name"] = normalized
-            entry["score"] = score
-            save_scores(entries)
-            return entries
-    entries.append({"name": normalized, "score": score})
-    save_scores(entries)
+def save_scores(entries):
+    with FileLock(_lock_path()):
+        _write_snapshot(entries)
+    _cache.invalidate()
+
+
+def _compact():
+    cache = _refresh()
+    entries = list(cache.entries.values())
+    _write_snapshot(entries)
+    cache.signature = _signature()
     return entries
 
 
-def get_leaderboard():
-    entries = load_scores()
-    return sorted(entries, key=lambda item: (-item["score"], item["name"].lower()))
+def compact():
+    flush()
+    with FileLock(_lock_path()):
+        return _compact()
+
+
+def _append_journal(entries):
+    record = b"".join(
+        json.dumps(entry, separators=(",", ":")).encode("utf-8") + b"\n" for entry in entries
+    )
+    with _journal_path().open("a+b") as file_handle:
+        size = file_handle.seek(0, os.SEEK_END)
+        if size:
+            file_handle.seek(size - 1)
+            if file_handle.read(1) != b"\n":
+                record = b"\n" + record
+        file_handle.write(record)
+        file_handle.flush()
+        os.fsync(file_handle.fileno())
+        return size, size + len(record)
+
+
+def pending():
+    return len(_pending)
+
+
+def flush(timeout=None):
+    if not _pending:
+        return 0
+    entries = list(_pending.values())
+    if _use_database():
+        _query(ScoreDatabase.upsert_many, entries, timeout=timeout)
+    else:
+        with FileLock(_lock_path(), timeout=timeout):
+            signature = _signature()
+            start, end = _append_journal(entries)
+            if signature == _cache.signature and (signature[2] or (0, 0))[1] == start:
+                for entry in entries:
+                    _cache.apply(dict(entry))
+                _cache.signature = _signature()
+            else:
+                _cache.invalidate()
+            if end > config.SCOREBOARD_JOURNAL_MAX_BYTES:
+                _compact()
+    _pending.clear()
+    return len(entries)
+
+
+def update_score(name, score, timeout=None):
+    entry = {"name": name.lower(), "score": score}
+    _pending.pop(entry["name"], None)
+    _pending[entry["name"]] = entry
+    if len(_pending) >= config.SCOREBOARD_BATCH_SIZE:
+        flush(timeout)
+    return entry
+
+
+def get_leaderboard(limit=None):
+    return get_leaderboard_page(0, limit)
+
+
+def get_leaderboard_page(offset, limit=None, timeout=None):
+    flush(timeout)
+    if _use_database():
+        return _query(ScoreDatabase.top, limit, offset, timeout=timeout)
+    return _cached(timeout).page(offset, limit)
+
+
+def leaderboard_size(timeout=None):
+    flush(timeout)
+    if _use_database():
+        return _query(ScoreDatabase.count, timeout=timeout)
+    return len(_cached(timeout).ranking)
+
+
+def find_rank(name, timeout=None):
+    flush(timeout)
+    if _use_database():
+        return _query(ScoreDatabase.rank, name, timeout=timeout)
+    return _cached(timeout).rank(name)
+
+
+class LeaderboardPages:
+    def __init__(self, page_size=None, timeout=None):
+        self.page_size = page_size or config.LEADERBOARD_PAGE_SIZE
+        self.timeout = timeout
+        self.fetches = 0
+        self._pages = {}
+        self.refresh()
+
+    def refresh(self):
+        self.total = leaderboard_size(self.timeout)
+        self._pages.clear()
+
+    def __len__(self):
+        return self.total
+
+    def __getitem__(self, index):
+        number, position = divmod(index, self.page_size)
+        page = self._pages.get(number)
+        if page is None:
+            try:
+                page = get_leaderboard_page(number * self.page_size, self.page_size, self.timeout)
+            except (LockTimeout, OSError):
+                return None
+            self._pages[number] = page
+            self.fetches += 1
+        return page[position] if position < len(page) else None
+
+    def find(self, name):
+        try:
+            self.refresh()
+            return find_rank(name, self.timeout)
+        except (LockTimeout, OSError):
+            return None
 
 
 def validate_name(name):
@@ -0,0 +1,105 @@
+import multiprocessing
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+import config
+from sudoku import NodeBudgetExceeded, SudokuBoard
+
+SOLVED = "solved"
+NO_SOLUTION = "no_solution"
+NODE_BUDGET = "node_budget"
+TIMED_OUT = "timed_out"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+
+@dataclass
+class SolveResult:
+    status: str
+    grid: Optional[List[int]] = None
+    nodes: int = 0
+    seconds: float = 0.0
+
+
+def _run(grid, method, max_nodes):
+    board = SudokuBoard()
+    board.load_puzzle(grid)
+    try:
+        if board.solve(method, max_nodes):
+            message = (SOLVED, board.to_grid())
+        else:
+            message = (NO_SOLUTION, None)
+    except NodeBudgetExceeded:
+        message = (NODE_BUDGET, None)
+    return message + (board.last_solve_stats.nodes,)
+
+
+def _solve(grid, method, max_nodes, connection):
+    connection.send(_run(grid, method, max_nodes))
+    connection.close()
+
+
+class SolveJob:
+    def __init__(
+        self,
+        grid,
+        method=config.SOLVER_METHOD,
+        time_budget=config.SOLVER_TIME_BUDGET,
+        max_nodes=config.SOLVER_NODE_BUDGET,
+        inline_nodes=config.SOLVER_INLINE_NODE_BUDGET,
+    ):
+        self.grid = list(grid)
+        self.started = time.monotonic()
+        self.deadline = None if time_budget is None else self.started + time_budget
+        self.result = None
+        self._process = None
+        self._receiver = None
+        if inline_nodes:
+            final = max_nodes is not None and max_nodes <= inline_nodes
+            status, solved, nodes = _run(
+                self.grid, method, max_nodes if final else inline_nodes
+            )
+            if status != NODE_BUDGET or final:
+                self.result = SolveResult(status, solved, nodes, time.monotonic() - self.started)
+                return
+        context = multiprocessing.get_context("spawn")
+        self._receiver, sender = context.Pipe(duplex=False)
+        self._process = context.Process(
+            target=_solve,
+            args=(self.grid, method, max_nodes, sender),
+            daemon=True,
+        )
+        self._process.start()
+        sender.close()
+
+    def running(self):
+        return self.result is None
+
+    def poll(self):
+        if self.result is not None:
+            return self.result
+        if self._receiver.poll():
+            try:
+                status, grid, nodes = self._receiver.recv()
+            except (EOFError, OSError):
+                return self._finish(FAILED)
+            return self._finish(status, grid, nodes)
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return self._finish(TIMED_OUT)
+        if not self._process.is_alive() and not self._receiver.poll():
+            return self._finish(FAILED)
+        return None
+
+    def cancel(self):
+        if self.result is None:
+            self._finish(CANCELLED)
+        return self.result
+
+    def _finish(self, status, grid=None, nodes=0):
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process.join()
+        self._receiver.close()
+        self.result = SolveResult(status, grid, nodes, time.monotonic() - self.started)
+        return self.result
@@ -1,67 +1,264 @@
 import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from exact_cover import ExactCoverSolver, NodeBudgetExceeded
+
+DIGIT_MASK = 0x3FE
+
+NODES = tuple((index // 9, index % 9) for index in range(81))
+CELL_UNITS = tuple(
+    (row, 9 + col, 18 + (row // 3) * 3 + col // 3) for row, col in NODES
+)
+UNIT_CELLS = tuple(
+    tuple(index for index in range(81) if unit in CELL_UNITS[index])
+    for unit in range(27)
+)
+NEIGHBORS = tuple(
+    tuple(
+        sorted(
+            {other for unit in CELL_UNITS[index] for other in UNIT_CELLS[unit]} - {index}
+        )
+    )
+    for index in range(81)
+)
+_GRAPH = {
+    NODES[index]: {NODES[other] for other in neighbors}
+    for index, neighbors in enumerate(NEIGHBORS)
+}
+_EMPTY_COUNTS = bytes(([9] + [0] * 9) * 27)
+_POPCOUNT = [bin(mask).count("1") for mask in range(1024)]
+
+
+def iter_digits(mask):
+    digit = 1
+    mask >>= 1
+    while mask:
+        if mask & 1:
+            yield digit
+        mask >>= 1
+        digit += 1
+
+
+@dataclass
+class SolverStats:
+    method: str = ""
+    nodes: int = 0
+    backtracks: int = 0
+    propagated: int = 0
+    max_nodes: Optional[int] = None
+
+
+@dataclass
+class GenerationStats:
+    difficulty: str = ""
+    unique: bool = False
+    removed: int = 0
+    solver_calls: int = 0
+    nodes: int = 0
+    backtracks: int = 0
+
+
+@dataclass
+class SolveProgress:
+    assignments: int = 0
+    backtracks: int = 0
+    depth: int = 0
+    max_depth: int = 0
+    done: bool = False
+    solved: bool = False
+
+
+@dataclass
+class SolveStep:
+    kind: str
+    row: int
+    col: int
+    value: int
 
 
 class SudokuBoard:
-    def __init__(self):
-        self.graph = {}
-        self.values = {}
-        self.givens = set()
-        self.solution = {}
-        self._create_graph()
-
-    def _create_graph(self):
-        for row in range(9):
-            for col in range(9):
-                node = (row, col)
-                self.graph[node] = self._get_neighbors(row, col)
-                self.values[node] = 0
-
-    def _get_neighbors(self, row, col):
-        neighbors = set()
-        for c in range(9):
-            if c != col:
-                neighbors.add((row, c))
-
-        for r in range(9):
-            if r != row:
-                neighbors.add((r, col))
-
-        subgrid_row_start = (row // 3) * 3
-        subgrid_col_start = (col // 3) * 3
-        for r in range(subgrid_row_start, subgrid_row_start + 3):
-            for c in range(subgrid_col_start, subgrid_col_start + 3):
-                if (r, c) != (row, col):
-                    neighbors.add((r, c))
-
-        return neighbors
+    __slots__ = (
+        "rng",
+        "last_solve_stats",
+        "last_generate_stats",
+        "_cells",
+        "_givens",
+        "_solution",
+        "_unit_counts",
+        "_unit_masks",
+        "_filled",
+        "_duplicates",
+        "_conflicts",
+    )
+
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random
+        self.last_solve_stats = SolverStats()
+        self.last_generate_stats = GenerationStats()
+        self._cells = bytearray(81)
+        self._givens = bytearray(81)
+        self._solution = bytearray(81)
+        self._unit_counts = bytearray(_EMPTY_COUNTS)
+        self._unit_masks = [1] * 27
+        self._filled = 0
+        self._duplicates = set()
+        self._conflicts = frozenset()
+
+    @property
+    def graph(self):
+        return _GRAPH
+
+    @property
+    def values(self):
+        return dict(zip(NODES, self._cells))
+
+    @property
+    def givens(self):
+        return {NODES[index] for index, given in enumerate(self._givens) if given}
+
+    @property
+    def solution(self):
+        if not any(self._solution):
+            return {}
+        return dict(zip(NODES, self._solution))
+
+    def copy(self):
+        board = SudokuBoard.__new__(SudokuBoard)
+        board.rng = self.rng
+        board.last_solve_stats = SolverStats()
+        board.last_generate_stats = GenerationStats()
+        board._cells = self._cells[:]
+        board._givens = self._givens[:]
+        board._solution = self._solution[:]
+        board._unit_counts = self._unit_counts[:]
+        board._unit_masks = self._unit_masks[:]
+        board._filled = self._filled
+        board._duplicates = set(self._duplicates)
+        board._conflicts = self._conflicts
+        return board
+
+    def snapshot(self):
+        return bytes(self._cells + self._givens)
+
+    def restore(self, snapshot):
+        self._load_cells(snapshot[:81])
+        self._givens[:] = snapshot[81:162]
+
+    def _reset_masks(self):
+        self._unit_counts[:] = _EMPTY_COUNTS
+        self._unit_masks[:] = [1] * 27
+        self._filled = 0
+        self._duplicates.clear()
+        self._conflicts = frozenset()
+
+    def _load_cells(self, cells):
+        self._cells[:] = bytes(81)
+        self._reset_masks()
+        for index, value in enumerate(cells):
+            if value:
+                self._set_index(index, value)
+
+    def _shift_digit(self, units, digit, delta):
+        counts = self._unit_counts
+        masks = self._unit_masks
+        bit = 1 << digit
+        for unit in units:
+            slot = unit * 10 + digit
+            count = counts[slot] + delta
+            counts[slot] = count
+            if count:
+                masks[unit] |= bit
+            else:
+                masks[unit] &= ~bit
+            if not digit:
+                continue
+            if delta > 0 and count >= 2:
+                self._duplicates.add((unit, digit))
+                self._conflicts = None
+            elif delta < 0 and count >= 1:
+                if count == 1:
+                    self._duplicates.discard((unit, digit))
+                self._conflicts = None
 
     def reset(self):
-        for node in self.values:
-            self.values[node] = 0
-        self.givens.clear()
-        self.solution.clear()
+        self._cells[:] = bytes(81)
+        self._givens[:] = bytes(81)
+        self._solution[:] = bytes(81)
+        self._reset_masks()
 
     def get_value(self, row, col):
-        return self.values.get((row, col), 0)
+        if 0 <= row < 9 and 0 <= col < 9:
+            return self._cells[row * 9 + col]
+        return 0
 
     def set_value(self, row, col, value):
-        self.values[(row, col)] = value
+        self._set_index(row * 9 + col, value)
+
+    def _set_index(self, index, value):
+        previous = self._cells[index]
+        if previous == value:
+            return
+        self._cells[index] = value
+        units = CELL_UNITS[index]
+        self._shift_digit(units, previous, -1)
+        self._shift_digit(units, value, 1)
+        if not previous:
+            self._filled += 1
+        elif not value:
+            self._filled -= 1
+
+    def filled_count(self):
+        return self._filled
+
+    def conflict_count(self):
+        return len(self._duplicates)
+
+    def get_conflicts(self):
+        if self._conflicts is None:
+            cells = self._cells
+            self._conflicts = frozenset(
+                NODES[index]
+                for unit, digit in self._duplicates
+                for index in UNIT_CELLS[unit]
+                if cells[index] == digit
+            )
+        return self._conflicts
 
     def is_given(self, row, col):
-        return (row, col) in self.givens
+        return bool(self._givens[row * 9 + col])
 
     def has_solution(self):
-        return bool(self.solution)
+        return any(self._solution)
 
     def get_solution_value(self, row, col):
-        return self.solution.get((row, col), 0)
+        return self._solution[row * 9 + col]
 
     def is_valid(self, row, col, num):
-        node = (row, col)
-        for neighbor in self.graph[node]:
-            if self.get_value(*neighbor) == num:
-                return False
-        return True
+        index = row * 9 + col
+        row_unit, col_unit, box_unit = CELL_UNITS[index]
+        if self._cells[index] != num:
+            masks = self._unit_masks
+            return not (masks[row_unit] | masks[col_unit] | masks[box_unit]) >> num & 1
+        counts = self._unit_counts
+        return (
+            counts[row_unit * 10 + num] == 1
+            and counts[col_unit * 10 + num] == 1
+            and counts[box_unit * 10 + num] == 1
+        )
+
+    def candidate_mask(self, row, col):
+        return self._candidate_mask(row * 9 + col)
+
+    def _candidate_mask(self, index):
+        row_unit, col_unit, box_unit = CELL_UNITS[index]
+        masks = self._unit_masks
+        return ~(masks[row_unit] | masks[col_unit] | masks[box_unit]) & DIGIT_MASK
+
+    def get_candidates(self, row, col):
+        return list(iter_digits(self.candidate_mask(row, col)))
 
     def make_move(self, row, col, value):
         if self.is_given(row, col):
@@ -77,65 +274,252 @@ class SudokuBoard:
         self.set_value(row, col, 0)
         return True
 
-    def solve(self):
-        empty = self._find_empty()
-        if not empty:
+    def to_grid(self):
+        return list(self._cells)
+
+    def solution_grid(self):
+        return list(self._solution)
+
+    def load_puzzle(self, grid, solution=None):
+        self._load_cells(grid)
+        self._givens[:] = bytes(1 if value else 0 for value in self._cells)
+        self._solution[:] = bytes(solution) if solution else bytes(81)
+
+    def solve(self, method="backtracking", max_nodes=None):
+        solver = get_solver(method)
+        self.last_solve_stats = SolverStats(method, max_nodes=max_nodes)
+        if max_nodes is None:
+            return solver.solve(self)
+        snapshot = self.snapshot()
+        try:
+            return solver.solve(self)
+        except NodeBudgetExceeded:
+            self.restore(snapshot)
+            raise
+
+    def fill_from(self, grid):
+        for index, value in enumerate(grid):
+            if value and not self._cells[index]:
+                self._set_index(index, value)
+
+    def iter_solutions(self, method="dlx"):
+        solver = get_solver(method)
+        if not hasattr(solver, "iter_solutions"):
+            raise ValueError(f"Solver {method} cannot enumerate solutions")
+        self.last_solve_stats = SolverStats(method)
+        return solver.iter_solutions(self)
+
+    def _solve_backtracking(self):
+        index = self._find_empty()
+        if index is None:
+            return True
+
+        stats = self.last_solve_stats
+        for num in iter_digits(self._candidate_mask(index)):
+            stats.nodes += 1
+            if stats.max_nodes is not None and stats.nodes > stats.max_nodes:
+                raise NodeBudgetExceeded(stats.nodes)
+            self._set_index(index, num)
+            if self._solve_backtracking():
+                return True
+            self._set_index(index, 0)
+            stats.backtracks += 1
+
+        return False
+
+    def _solve_mrv(self):
+        assigned = []
+        if not self._propagate_singles(assigned):
+            self._undo(assigned)
+            return False
+
+        target = self._find_most_constrained()
+        if target is None:
             return True
 
-        row, col = empty
-        for num in range(1, 10):
-            if self.is_valid(row, col, num):
-                self.set_value(row, col, num)
-                if self.solve():
-                    return True
-                self.set_value(row, col, 0)
+        stats = self.last_solve_stats
+        index, mask = target
+        for num in iter_digits(mask):
+            stats.nodes += 1
+            if stats.max_nodes is not None and stats.nodes > stats.max_nodes:
+                raise NodeBudgetExceeded(stats.nodes)
+            self._set_index(index, num)
+            if self._solve_mrv():
+                return True
+            self._set_index(index, 0)
+            stats.backtracks += 1
 
+        self._undo(assigned)
         return False
 
+    def _propagate_singles(self, assigned):
+        stats = self.last_solve_stats
+        cells = self._cells
+        progress = True
+        while progress:
+            progress = False
+            for index in range(81):
+                if cells[index]:
+                    continue
+                mask = self._candidate_mask(index)
+                if not mask:
+                    return False
+                if mask & (mask - 1) == 0:
+                    self._set_index(index, mask.bit_length() - 1)
+                    assigned.append(index)
+                    stats.propagated += 1
+                    progress = True
+
+            for unit, unit_cells in enumerate(UNIT_CELLS):
+                for num in iter_digits(DIGIT_MASK & ~self._unit_masks[unit]):
+                    bit = 1 << num
+                    places = [
+                        index
+                        for index in unit_cells
+                        if cells[index] == 0 and self._candidate_mask(index) & bit
+                    ]
+                    if not places:
+                        return False
+                    if len(places) == 1:
+                        self._set_index(places[0], num)
+                        assigned.append(places[0])
+                        stats.propagated += 1
+                        progress = True
+        return True
+
+    def _find_most_constrained(self):
+        best = None
+        best_count = 10
+        cells = self._cells
+        for index in range(81):
+            if cells[index]:
+                continue
+            mask = self._candidate_mask(index)
+            count = _POPCOUNT[mask]
+            if count < best_count:
+                best = (index, mask)
+                best_count = count
+                if count <= 1:
+                    break
+        return best
+
+    def _undo(self, assigned):
+        for index in reversed(assigned):
+            self._set_index(index, 0)
+
+    def _has_consistent_values(self):
+        return not self._duplicates
+
+    def iter_solve_steps(self, progress=None):
+        if progress is None:
+            progress = SolveProgress()
+        if not self._has_consistent_values():
+            progress.done = True
+            return
+
+        stack = []
+        advance = True
+        while True:
+            if advance:
+                target = self._find_most_constrained()
+                if target is None:
+                    progress.done = True
+                    progress.solved = True
+                    return
+                index, mask = target
+                stack.append((index, iter_digits(mask)))
+
+            index, digits = stack[-1]
+            value = next(digits, 0)
+            if value:
+                self._set_index(index, value)
+                progress.assignments += 1
+                progress.depth = len(stack)
+                progress.max_depth = max(progress.max_depth, progress.depth)
+                yield SolveStep("assign", index // 9, index % 9, value)
+                advance = True
+                continue
+
+            stack.pop()
+            progress.depth = len(stack)
+            if self._cells[index]:
+                self._set_index(index, 0)
+                progress.backtracks += 1
+                yield SolveStep("backtrack", index // 9, index % 9, 0)
+            if not stack:
+                progress.done = True
+                return
+            advance = False
+
+    def solve_stepwise(self):
+        return StepwiseSolve(self)
+
     def _fill_board(self):
-        empty = self._find_empty()
-        if not empty:
+        index = self._find_empty()
+        if index is None:
             return True
 
-        row, col = empty
-        nums = list(range(1, 10))
-        random.shuffle(nums)
+        stats = self.last_generate_stats
+        nums = list(iter_digits(self._candidate_mask(index)))
+        self.rng.shuffle(nums)
         for num in nums:
-            if self.is_valid(row, col, num):
-                self.set_value(row, col, num)
-                if self._fill_board():
-                    return True
-                self.set_value(row, col, 0)
+            stats.nodes += 1
+            self._set_index(index, num)
+            if self._fill_board():
+                return True
+            self._set_index(index, 0)
+            stats.backtracks += 1
 
         return False
 
     def _find_empty(self):
-        for node, value in self.values.items():
-            if value == 0:
-                return node
-        return None
+        index = self._cells.find(0)
+        return index if index >= 0 else None
 
-    def generate(self, difficulty):
+    def generate(self, difficulty, unique=False):
         self.reset()
+        stats = GenerationStats(difficulty, unique)
+        self.last_generate_stats = stats
         if not self._fill_board():
             return False
-        self.solution = dict(self.values)
+        self._solution[:] = self._cells
 
         cells_to_remove = self._cells_to_remove(difficulty)
-        all_cells = list(self.values.keys())
-        random.shuffle(all_cells)
+        all_cells = list(range(81))
+        self.rng.shuffle(all_cells)
 
-        removed = 0
-        for row, col in all_cells:
-            if removed >= cells_to_remove:
+        solver = None
+        if unique:
+            solver = get_solver("mrv")
+            self.last_solve_stats = SolverStats("mrv")
+        for index in all_cells:
+            if stats.removed >= cells_to_remove:
                 break
-            if self.get_value(row, col) != 0:
-                self.set_value(row, col, 0)
-                removed += 1
+            value = self._cells[index]
+            if value == 0:
+                continue
+            self._set_index(index, 0)
+            if solver is not None and self._has_other_solution(solver, index, value, stats):
+                self._set_index(index, value)
+                continue
+            stats.removed += 1
 
-        self.givens = {node for node, value in self.values.items() if value != 0}
+        self._givens[:] = bytes(1 if value else 0 for value in self._cells)
         return True
 
+    def _has_other_solution(self, solver, index, value, stats):
+        snapshot = self.snapshot()
+        for num in iter_digits(self._candidate_mask(index)):
+            if num == value:
+                continue
+            self._set_index(index, num)
+            stats.solver_calls += 1
+            if solver.solve(self):
+                self.restore(snapshot)
+                return True
+            self._set_index(index, 0)
+        return False
+
     def _cells_to_remove(self, difficulty):
         if difficulty == "easy":
             return 20
@@ -146,10 +530,121 @@ class SudokuBoard:
         return 0
 
     def check_win(self):
-        for node, value in self.values.items():
-            if value == 0:
-                return False
-            row, col = node
-            if not self.is_valid(row, col, value):
-                return False
+        return self._filled == 81 and not self._duplicates
+
+
+class StepwiseSolve:
+    def __init__(self, board):
+        self.board = board
+        self.progress = SolveProgress()
+        self.last_step = None
+        self._snapshot = board.snapshot()
+        self._steps = board.iter_solve_steps(self.progress)
+
+    @property
+    def done(self):
+        return self.progress.done
+
+    def advance(self, budget_ms=None, max_steps=None):
+        deadline = None if budget_ms is None else time.perf_counter() + budget_ms / 1000
+        taken = 0
+        for step in self._steps:
+            self.last_step = step
+            taken += 1
+            if max_steps is not None and taken >= max_steps:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        return taken
+
+    def finish(self):
+        return self.advance()
+
+    def cancel(self):
+        self._steps.close()
+        self.board.restore(self._snapshot)
+        self.progress.done = True
+
+
+class BacktrackingSolver:
+    metrics = ("nodes", "backtracks")
+
+    def solve(self, board):
+        return board._solve_backtracking()
+
+
+class MRVSolver:
+    metrics = ("nodes", "backtracks", "propagated")
+
+    def solve(self, board):
+        if not board._has_consistent_values():
+            return False
+        return board._solve_mrv()
+
+
+class DancingLinksSolver:
+    metrics = ("nodes", "backtracks")
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _get_engine(self):
+        engine = getattr(self._local, "engine", None)
+        if engine is None:
+            engine = ExactCoverSolver()
+            self._local.engine = engine
+        return engine
+
+    def iter_solutions(self, board):
+        engine = self._get_engine()
+        stats = board.last_solve_stats
+        solutions = engine.iter_solutions(board.to_grid())
+        try:
+            for grid in solutions:
+                stats.nodes = engine.nodes
+                stats.backtracks = engine.backtracks
+                yield dict(zip(NODES, grid))
+            stats.nodes = engine.nodes
+            stats.backtracks = engine.backtracks
+        finally:
+            solutions.close()
+
+    def count_solutions(self, board, limit=None):
+        return self._get_engine().count_solutions(board.to_grid(), limit)
+
+    def solve(self, board):
+        engine = self._get_engine()
+        stats = board.last_solve_stats
+        try:
+            grid = engine.solve(board.to_grid(), stats.max_nodes)
+        finally:
+            stats.nodes = engine.nodes
+            stats.backtracks = engine.backtracks
+        if grid is None:
+            return False
+        for index, value in enumerate(grid):
+            board._set_index(index, value)
         return True
+
+
+_SOLVERS = {}
+
+
+def register_solver(name, solver):
+    _SOLVERS[name] = solver
+
+
+def get_solver(name):
+    try:
+        return _SOLVERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown solver method: {name}") from None
+
+
+def available_solvers():
+    return tuple(_SOLVERS)
+
+
+register_solver("backtracking", BacktrackingSolver())
+register_solver("mrv", MRVSolver())
+register_solver("dlx", DancingLinksSolver())
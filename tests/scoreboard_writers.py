@@ -0,0 +1,43 @@
+import multiprocessing
+import time
+from pathlib import Path
+
+import config
+import scoreboard
+
+
+def write_scores(directory, writer, count, batch_size, max_bytes, barrier=None):
+    path = Path(directory) / config.SCOREBOARD_FILE
+    scoreboard._score_path = lambda: path
+    config.SCOREBOARD_BATCH_SIZE = batch_size
+    config.SCOREBOARD_JOURNAL_MAX_BYTES = max_bytes
+    if barrier is not None:
+        barrier.wait()
+    for index in range(count):
+        scoreboard.update_score(f"w{writer}-{index}", index)
+        scoreboard.update_score(f"last{writer}", index)
+        if index % 10 == 0:
+            scoreboard.get_leaderboard(config.LEADERBOARD_MAX_ENTRIES)
+    scoreboard.flush()
+
+
+def run_writers(directory, writers, count, batch_size, max_bytes):
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(writers + 1)
+    processes = [
+        context.Process(
+            target=write_scores,
+            args=(directory, writer, count, batch_size, max_bytes, barrier),
+        )
+        for writer in range(writers)
+    ]
+    for process in processes:
+        process.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+    if any(process.exitcode for process in processes):
+        raise RuntimeError("a writer process failed")
+    return elapsed
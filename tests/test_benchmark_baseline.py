@@ -0,0 +1,32 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from benchmarks import baseline
+
+
+class TestBaseline(unittest.TestCase):
+    def test_compare_flags_only_slowdowns_beyond_tolerance_and_slack(self):
+        expected = {"fast": 1.0, "slow": 1.0, "tiny": 0.001, "gone": 5.0}
+        results = {"fast": 1.2, "slow": 1.6, "tiny": 0.01, "new": 3.0}
+        regressions = baseline.compare(results, expected, tolerance=0.5, slack=0.02)
+        self.assertEqual(regressions, [("slow", 1.0, 1.6)])
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "nested" / "render.json"
+            baseline.save(path, {"case": 0.25}, seed=3)
+            self.assertEqual(baseline.load(path), {"case": 0.25})
+            self.assertIsNone(baseline.load(Path(tmp) / "missing.json"))
+
+    def test_check_fails_after_a_confirmed_regression(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "render.json"
+            baseline.save(path, {"case": 1.0})
+            baseline.check({"case": 3.0}, path, 0.5, rerun=lambda name: 1.1)
+            with self.assertRaises(SystemExit):
+                baseline.check({"case": 3.0}, path, 0.5, rerun=lambda name: 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
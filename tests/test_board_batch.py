@@ -0,0 +1,102 @@
+import random
+import unittest
+
+from sudoku import SudokuBoard
+
+try:
+    import numpy as np
+
+    import board_batch
+except ImportError:
+    np = None
+
+
+def sample_grids(count, seed):
+    rng = random.Random(seed)
+    board = SudokuBoard(rng=rng)
+    grids = []
+    for _ in range(count):
+        board.generate(rng.choice(("easy", "medium", "hard")))
+        puzzle = board.to_grid()
+        solution = board.solution_grid()
+        for grid in (puzzle, solution):
+            for _ in range(rng.randrange(3)):
+                grid[rng.randrange(81)] = rng.randrange(10)
+        grids.extend([puzzle, solution, board.solution_grid()])
+    return grids
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestBoardBatch(unittest.TestCase):
+    def test_matches_board_semantics(self):
+        grids = sample_grids(30, 4)
+        report = board_batch.audit(np.array(grids, dtype=np.uint8))
+        board = SudokuBoard()
+        for index, grid in enumerate(grids):
+            board.load_puzzle(grid)
+            self.assertEqual(bool(report["win"][index]), board.check_win())
+            self.assertEqual(
+                bool(report["complete"][index]), board.filled_count() == 81
+            )
+            conflicts = {
+                (cell // 9, cell % 9)
+                for cell in np.flatnonzero(report["conflicts"][index])
+            }
+            self.assertEqual(conflicts, board.get_conflicts())
+            for cell in range(81):
+                self.assertEqual(
+                    int(report["candidates"][index, cell]),
+                    board.candidate_mask(cell // 9, cell % 9),
+                )
+
+    def test_single_board_and_shape_checks(self):
+        board = SudokuBoard()
+        board.generate("easy")
+        self.assertTrue(board_batch.check_win(board.solution_grid())[0])
+        self.assertFalse(board_batch.is_complete(board.to_grid())[0])
+        with self.assertRaises(ValueError):
+            board_batch.as_boards(np.zeros((2, 80)))
+        with self.assertRaises(ValueError):
+            board_batch.as_boards(np.full((1, 81), 10))
+
+    def test_singles_round_is_sound(self):
+        rng = random.Random(9)
+        board = SudokuBoard(rng=rng)
+        puzzles, solutions = [], []
+        for _ in range(20):
+            board.generate("hard", unique=True)
+            puzzles.append(board.to_grid())
+            solutions.append(board.solution_grid())
+        puzzles = np.array(puzzles, dtype=np.uint8)
+        solutions = np.array(solutions, dtype=np.uint8)
+
+        result, dead_ends = board_batch.propagate_singles(puzzles)
+        self.assertFalse(dead_ends.any())
+        filled = result != 0
+        self.assertTrue((result[filled] == solutions[filled]).all())
+        self.assertGreater(filled.sum(), (puzzles != 0).sum())
+
+    def test_dead_end_detection(self):
+        grid = [0] * 81
+        for col, value in enumerate([1, 2, 3, 4, 5, 6, 7, 8]):
+            grid[col] = value
+        grid[9 + 8] = 9
+        _, dead_ends = board_batch.propagate_singles(grid)
+        self.assertTrue(dead_ends[0])
+
+    def test_colliding_singles_are_a_dead_end(self):
+        grid = [
+            int(char)
+            for char in (
+                "000090040780060030129500006002010800305600109"
+                "018000073830046500900000000260005390"
+            )
+        ]
+        self.assertTrue(board_batch.is_consistent(grid)[0])
+        result, dead_ends = board_batch.propagate_singles(grid)
+        self.assertTrue(board_batch.conflict_cells(result).any())
+        self.assertTrue(dead_ends[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+
+from exact_cover import ExactCoverSolver
+from sudoku import SudokuBoard, available_solvers
+
+ANTI_BACKTRACKING = (
+    "..............3.85..1.2.......5.7....."
+    "4...1...9.......5......73..2.1........4...9"
+)
+
+
+def parse(puzzle):
+    return [0 if char == "." else int(char) for char in puzzle]
+
+
+def is_complete_solution(grid):
+    groups = []
+    for index in range(9):
+        groups.append(grid[index * 9:index * 9 + 9])
+        groups.append(grid[index::9])
+        top, left = (index // 3) * 3, (index % 3) * 3
+        groups.append(
+            [grid[(top + r) * 9 + left + c] for r in range(3) for c in range(3)]
+        )
+    return all(sorted(group) == list(range(1, 10)) for group in groups)
+
+
+class TestExactCoverSolver(unittest.TestCase):
+    def setUp(self):
+        self.solver = ExactCoverSolver()
+
+    def matrix_state(self):
+        solver = self.solver
+        return (
+            list(solver.left),
+            list(solver.right),
+            list(solver.up),
+            list(solver.down),
+            list(solver.sizes),
+        )
+
+    def test_solves_and_keeps_givens(self):
+        grid = parse(ANTI_BACKTRACKING)
+        solution = self.solver.solve(grid)
+        self.assertTrue(is_complete_solution(solution))
+        for given, value in zip(grid, solution):
+            if given:
+                self.assertEqual(given, value)
+
+    def test_matrix_is_restored_between_puzzles(self):
+        before = self.matrix_state()
+        self.solver.solve(parse(ANTI_BACKTRACKING))
+        self.assertEqual(self.matrix_state(), before)
+
+        solutions = self.solver.iter_solutions([0] * 81)
+        next(solutions)
+        next(solutions)
+        solutions.close()
+        self.assertEqual(self.matrix_state(), before)
+
+    def test_lazy_enumeration_and_counting(self):
+        grid = parse(ANTI_BACKTRACKING)
+        self.assertEqual(self.solver.count_solutions(grid), 1)
+        grid[0] = 0
+        grid[14] = 0
+        self.assertEqual(self.solver.count_solutions(grid, limit=2), 2)
+
+        solutions = self.solver.iter_solutions([0] * 81)
+        first, second = next(solutions), next(solutions)
+        solutions.close()
+        self.assertNotEqual(first, second)
+        self.assertTrue(is_complete_solution(first))
+
+    def test_conflicting_givens_have_no_solution(self):
+        grid = [0] * 81
+        grid[0] = 5
+        grid[1] = 5
+        self.assertIsNone(self.solver.solve(grid))
+        self.assertEqual(self.solver.count_solutions(grid), 0)
+
+
+class TestDancingLinksBackend(unittest.TestCase):
+    def test_registered_with_board(self):
+        self.assertIn("dlx", available_solvers())
+
+    def test_board_solve_and_enumerate(self):
+        board = SudokuBoard()
+        for index, value in enumerate(parse(ANTI_BACKTRACKING)):
+            board.set_value(index // 9, index % 9, value)
+        solutions = list(board.iter_solutions("dlx"))
+        self.assertEqual(len(solutions), 1)
+        stats = board.last_solve_stats
+        self.assertGreater(stats.nodes, 0)
+        self.assertEqual(stats.backtracks, stats.nodes)
+        self.assertTrue(board.solve("dlx"))
+        self.assertTrue(board.check_win())
+        self.assertEqual(dict(board.values), solutions[0])
+        self.assertGreater(board.last_solve_stats.nodes, 0)
+
+    def test_enumeration_requires_capable_solver(self):
+        with self.assertRaises(ValueError):
+            SudokuBoard().iter_solutions("backtracking")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,222 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from puzzle_pool import PuzzlePool
+from sudoku import SudokuBoard
+
+try:
+    import pygame
+
+    import config
+    import main
+    import overlays
+    import scoreboard
+    import ui
+except ImportError:
+    pygame = scoreboard = None
+
+
+def key_event(key, unicode=""):
+    return pygame.event.Event(pygame.KEYDOWN, key=key, unicode=unicode, mod=0)
+
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class TestOverlayStack(unittest.TestCase):
+    def test_events_go_to_the_top_open_overlay(self):
+        stack = overlays.OverlayStack()
+        self.assertFalse(stack.handle_event(key_event(pygame.K_ESCAPE)))
+        stack.push(overlays.InstructionsOverlay())
+        prompt = overlays.SaveScorePrompt(40)
+        stack.push(prompt)
+        version = stack.version
+        self.assertTrue(stack.handle_event(key_event(pygame.K_y)))
+        self.assertTrue(prompt.closed)
+        self.assertTrue(prompt.result)
+        self.assertGreater(stack.version, version)
+        self.assertTrue(stack.handle_event(key_event(pygame.K_ESCAPE)))
+        self.assertEqual(len(stack.pop_closed()), 2)
+        self.assertFalse(stack)
+
+    def test_unhandled_input_is_still_consumed(self):
+        stack = overlays.OverlayStack()
+        stack.push(overlays.LeaderboardOverlay([]))
+        version = stack.version
+        self.assertTrue(stack.handle_event(key_event(pygame.K_5, "5")))
+        self.assertEqual(stack.version, version)
+        self.assertEqual(stack.pop_closed(), [])
+
+    def test_name_prompt_validates_before_closing(self):
+        prompt = overlays.NamePrompt(10)
+        prompt.handle_event(key_event(pygame.K_RETURN))
+        self.assertFalse(prompt.closed)
+        self.assertTrue(prompt.error_message)
+        for char in "Ada":
+            prompt.handle_event(key_event(pygame.K_a, char))
+        prompt.handle_event(key_event(pygame.K_BACKSPACE))
+        prompt.handle_event(key_event(pygame.K_RETURN))
+        self.assertTrue(prompt.closed)
+        self.assertEqual(prompt.result, "Ad")
+
+    def test_overlays_are_centered_in_the_main_window(self):
+        overlay = overlays.InstructionsOverlay()
+        screen_rect = pygame.Rect(0, 0, config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
+        self.assertTrue(screen_rect.contains(overlay.rect))
+        self.assertEqual(overlay.rect.center, screen_rect.center)
+
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class TestLeaderboardOverlay(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        self.fonts = {name: pygame.font.Font(None, 24) for name in ("counter", "cell", "console")}
+        self.screen = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        self.theme = config.THEMES["dark"]
+        self.entries = [{"name": f"p{index}", "score": 1000 - index} for index in range(1000)]
+
+    def type_text(self, overlay, text):
+        for char in text:
+            overlay.handle_event(key_event(0, char))
+
+    def test_scrolling_is_clamped_to_the_table(self):
+        overlay = overlays.LeaderboardOverlay(self.entries, visible_rows=10)
+        self.assertFalse(overlay.handle_event(key_event(pygame.K_UP)))
+        self.assertTrue(overlay.handle_event(key_event(pygame.K_PAGEDOWN)))
+        self.assertEqual(overlay.top, 10)
+        overlay.handle_event(pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=-1))
+        self.assertEqual(overlay.top, 10 + config.LEADERBOARD_SCROLL_ROWS)
+        overlay.handle_event(key_event(pygame.K_END))
+        self.assertEqual(overlay.top, 990)
+        self.assertFalse(overlay.handle_event(key_event(pygame.K_DOWN)))
+        overlay.handle_event(key_event(pygame.K_HOME))
+        self.assertEqual(overlay.top, 0)
+
+    def test_search_jumps_to_a_player_and_escape_only_cancels_it(self):
+        overlay = overlays.LeaderboardOverlay(self.entries, visible_rows=10)
+        overlay.handle_event(key_event(pygame.K_SLASH, "/"))
+        self.type_text(overlay, "P500")
+        overlay.handle_event(key_event(pygame.K_RETURN))
+        self.assertEqual((overlay.highlight, overlay.top), (500, 495))
+        self.assertIn("rank 501", overlay.message)
+        overlay.handle_event(key_event(pygame.K_SLASH, "/"))
+        self.type_text(overlay, "nobody")
+        overlay.handle_event(key_event(pygame.K_ESCAPE))
+        self.assertFalse(overlay.closed)
+        self.assertIsNone(overlay.query)
+        overlay.handle_event(key_event(pygame.K_ESCAPE))
+        self.assertTrue(overlay.closed)
+
+    def test_search_survives_a_rank_outside_the_loaded_rows(self):
+        class StalePages(list):
+            def find(self, name):
+                return len(self) + 3
+
+        overlay = overlays.LeaderboardOverlay(StalePages(self.entries[:5]), visible_rows=10)
+        self.assertTrue(overlay.jump_to("late"))
+        self.assertIsNone(overlay.highlight)
+        self.assertIn("No player", overlay.message)
+
+    def test_only_visible_rows_are_rendered_and_cached(self):
+        overlay = overlays.LeaderboardOverlay(self.entries, visible_rows=10)
+        overlay.draw(self.screen, self.fonts, self.theme)
+        self.assertEqual(sorted(overlay._rows), list(range(10)))
+        first = overlay._rows[0][1]
+        overlay.draw(self.screen, self.fonts, self.theme)
+        self.assertIs(overlay._rows[0][1], first)
+        for _ in range(300):
+            overlay.scroll(3)
+            overlay.draw(self.screen, self.fonts, self.theme)
+        window = 10 * config.LEADERBOARD_ROW_CACHE_PAGES
+        self.assertLessEqual(len(overlay._rows), 10 + 2 * window)
+        self.assertIn(overlay.top, overlay._rows)
+
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class TestFinishOverlay(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / config.SCOREBOARD_FILE
+        self._score_path = scoreboard._score_path
+        scoreboard._score_path = lambda: self.path
+
+    def tearDown(self):
+        scoreboard._score_path = self._score_path
+        scoreboard._pending.clear()
+        scoreboard._cache.invalidate()
+        self._tmp.cleanup()
+
+    @unittest.skipIf(scoreboard is not None and scoreboard.fcntl is None, "no fcntl")
+    def test_busy_leaderboard_defers_the_save_instead_of_raising(self):
+        prompt = overlays.NamePrompt(42)
+        prompt.close("ada")
+        activity_log = ui.ActivityLog()
+        with scoreboard.FileLock(scoreboard._lock_path()):
+            main.finish_overlay(overlays.OverlayStack(), prompt, activity_log)
+            main.retry_pending_scores(activity_log)
+        self.assertIn("busy", activity_log[0])
+        self.assertEqual(scoreboard.pending(), 1)
+        main.retry_pending_scores(activity_log)
+        self.assertEqual(scoreboard.pending(), 0)
+        self.assertEqual(scoreboard.load_scores(), [{"name": "ada", "score": 42}])
+
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class TestPoolStats(unittest.TestCase):
+    def test_pool_stats_are_logged(self):
+        pool = PuzzlePool(size=1, difficulties=("easy",), unique=False)
+        pool.load_into(SudokuBoard(rng=random.Random(1)), "easy")
+        activity_log = ui.ActivityLog()
+        main.log_pool_stats(pool, activity_log)
+        self.assertEqual(activity_log[0], "Pool ready: easy 0.")
+        self.assertIn("Refills: 0", activity_log[1])
+        self.assertEqual(activity_log[2], "Pool: 0 hits, 1 misses, 0 from bank.")
+
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class TestOverlayRendering(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        self.fonts = {name: pygame.font.Font(None, 24) for name in ("counter", "cell", "console")}
+        self.screen = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        self.buttons = ui.create_buttons()
+        self.theme = config.THEMES["dark"]
+        self.board = SudokuBoard(rng=random.Random(8))
+        self.board.generate("easy")
+
+    def render(self, renderer, stack, move_count):
+        return renderer.render(
+            self.screen,
+            self.board,
+            self.fonts,
+            self.buttons,
+            self.theme,
+            move_count=move_count,
+            overlays=stack,
+        )
+
+    def expected(self, stack, move_count):
+        reference = self.screen.copy()
+        ui.draw_background(reference, self.fonts, self.buttons, self.theme)
+        ui.draw_grid(reference, self.board, None, self.fonts, self.theme)
+        ui.draw_move_counter(reference, self.fonts, move_count, 0, self.theme)
+        stack.draw(reference, self.fonts, self.theme)
+        return pygame.image.tostring(reference, "RGB")
+
+    def test_game_updates_underneath_an_open_overlay(self):
+        renderer = ui.DirtyRenderer()
+        stack = overlays.OverlayStack()
+        self.render(renderer, stack, 0)
+        stack.push(overlays.NamePrompt(5))
+        self.assertEqual(self.render(renderer, stack, 0), [self.screen.get_rect()])
+        self.assertEqual(self.render(renderer, stack, 0), [])
+        self.render(renderer, stack, 1)
+        self.assertEqual(pygame.image.tostring(self.screen, "RGB"), self.expected(stack, 1))
+        stack.handle_event(key_event(pygame.K_ESCAPE))
+        stack.pop_closed()
+        self.assertEqual(self.render(renderer, stack, 1), [self.screen.get_rect()])
+        self.assertEqual(pygame.image.tostring(self.screen, "RGB"), self.expected(stack, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import csv
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import profiler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, ms):
+        self.now += ms / 1000
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def record(self, frame_profiler, events_ms, render_ms):
+        frame_profiler.begin_frame()
+        self.clock.advance(events_ms)
+        frame_profiler.mark("events")
+        self.clock.advance(render_ms)
+        frame_profiler.mark("render")
+        frame_profiler.end_frame()
+
+    def test_disabled_profiler_records_nothing(self):
+        frame_profiler = profiler.FrameProfiler(clock=self.clock)
+        self.record(frame_profiler, 1, 2)
+        self.assertEqual(len(frame_profiler.frames), 0)
+        self.assertEqual(frame_profiler.stages(), [])
+
+    def test_summary_reports_percentiles_per_stage(self):
+        frame_profiler = profiler.FrameProfiler(enabled=True, clock=self.clock)
+        for index in range(100):
+            self.record(frame_profiler, 1, index + 1)
+        summary = frame_profiler.summary()
+        self.assertEqual(frame_profiler.stages(), ["events", "render"])
+        self.assertAlmostEqual(summary["render"]["p50"], 50)
+        self.assertAlmostEqual(summary["render"]["p95"], 95)
+        self.assertAlmostEqual(summary["render"]["p99"], 99)
+        self.assertAlmostEqual(summary["render"]["max"], 100)
+        self.assertAlmostEqual(summary["total"]["max"], 101)
+        self.assertAlmostEqual(summary["events"]["p99"], 1)
+
+    def test_window_is_rolling_but_worst_frames_are_kept(self):
+        frame_profiler = profiler.FrameProfiler(
+            window=10, worst_count=2, enabled=True, clock=self.clock
+        )
+        self.record(frame_profiler, 0, 50)
+        for _ in range(20):
+            self.record(frame_profiler, 0, 1)
+        self.record(frame_profiler, 0, 30)
+        self.assertEqual(len(frame_profiler.frames), 10)
+        self.assertAlmostEqual(frame_profiler.summary()["total"]["max"], 30)
+        worst = frame_profiler.worst_frames()
+        self.assertEqual([frame["frame"] for frame in worst], [0, 21])
+        self.assertAlmostEqual(worst[0]["stages"]["render"], 50)
+
+    def test_exports_csv_and_json(self):
+        frame_profiler = profiler.FrameProfiler(enabled=True, clock=self.clock)
+        for index in range(3):
+            self.record(frame_profiler, 1, index)
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = frame_profiler.export_csv(Path(tmp) / "profile.csv")
+            json_path = frame_profiler.export_json(Path(tmp) / "profile.json")
+            with csv_path.open(newline="") as file_handle:
+                rows = list(csv.reader(file_handle))
+            with json_path.open() as file_handle:
+                data = json.load(file_handle)
+        self.assertEqual(rows[0], ["frame", "total", "events", "render"])
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(data["frames"], 3)
+        self.assertEqual(len(data["samples"]), 3)
+        self.assertIn("p95", data["summary"]["render"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+import generate_bank
+import puzzle_bank
+from puzzle_pool import PuzzlePool
+from sudoku import SudokuBoard, get_solver
+
+
+class TestPuzzleBank(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "test.bank"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, path, workers):
+        return generate_bank.build_bank(
+            path,
+            count=6,
+            difficulties=("easy", "hard"),
+            workers=workers,
+            seed=42,
+            chunk_size=4,
+            unique=True,
+            report=lambda line: None,
+        )
+
+    def test_pack_roundtrip(self):
+        grid = [random.Random(1).randrange(10) for _ in range(81)]
+        packed = puzzle_bank.pack_grid(grid)
+        self.assertEqual(len(packed), puzzle_bank.PACKED_GRID_SIZE)
+        self.assertEqual(puzzle_bank.unpack_grid(packed), grid)
+
+    def test_build_is_reproducible_across_worker_counts(self):
+        rates = self.build(self.path, workers=2)
+        self.assertEqual(set(rates), {"easy", "hard"})
+        other = Path(self.tmp.name) / "other.bank"
+        self.build(other, workers=1)
+        self.assertEqual(self.path.read_bytes(), other.read_bytes())
+        self.assertEqual(
+            len(self.path.read_bytes()),
+            len(puzzle_bank.MAGIC) + 12 * puzzle_bank.RECORD_SIZE,
+        )
+
+    def test_drawn_puzzles_load_into_board(self):
+        self.build(self.path, workers=2)
+        bank = puzzle_bank.PuzzleBank.load(self.path, random.Random(3))
+        self.assertEqual(bank.count("easy"), 6)
+        self.assertEqual(bank.count("medium"), 0)
+        self.assertIsNone(bank.draw("medium"))
+
+        seen = {tuple(bank.draw("hard")[0]) for _ in range(6)}
+        self.assertEqual(len(seen), 6)
+
+        board = SudokuBoard()
+        board.load_puzzle(*bank.draw("hard"))
+        self.assertEqual(get_solver("dlx").count_solutions(board, 2), 1)
+        for (row, col), value in board.values.items():
+            if value:
+                self.assertEqual(board.get_solution_value(row, col), value)
+
+    def test_pool_draws_from_bank_on_miss(self):
+        self.build(self.path, workers=1)
+        pool = PuzzlePool(size=1, bank=puzzle_bank.PuzzleBank.load(self.path))
+        board = SudokuBoard()
+        self.assertTrue(pool.load_into(board, "easy"))
+        stats = pool.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["bank_draws"], 1)
+
+    def test_missing_or_invalid_bank(self):
+        self.assertIsNone(puzzle_bank.PuzzleBank.load(self.path))
+        self.path.write_bytes(b"not a bank")
+        self.assertIsNone(puzzle_bank.PuzzleBank.load(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
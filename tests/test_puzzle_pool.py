@@ -0,0 +1,50 @@
+import random
+import unittest
+
+from puzzle_pool import PuzzlePool
+from sudoku import SudokuBoard
+
+
+class TestPuzzlePool(unittest.TestCase):
+    def setUp(self):
+        random.seed(13)
+        self.pool = PuzzlePool(size=2, difficulties=("easy", "hard"))
+
+    def tearDown(self):
+        self.pool.stop()
+
+    def test_empty_pool_falls_back_to_generation(self):
+        board = SudokuBoard()
+        self.assertTrue(self.pool.load_into(board, "easy"))
+        self.assertEqual(self.pool.misses, 1)
+        self.assertEqual(self.pool.hits, 0)
+        self.assertTrue(board.givens)
+        self.assertTrue(board.has_solution())
+
+    def test_prefetched_puzzle_is_loaded(self):
+        self.pool.start()
+        self.assertTrue(self.pool.wait_until_full(timeout=30))
+        self.assertEqual(self.pool.ready_count("hard"), 2)
+
+        board = SudokuBoard()
+        self.assertTrue(self.pool.load_into(board, "hard"))
+        stats = self.pool.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 0)
+        self.assertGreaterEqual(stats["refills"], 4)
+        self.assertGreater(stats["average_refill_ms"], 0)
+
+        self.assertFalse(board.check_win())
+        for (row, col), value in board.values.items():
+            if value:
+                self.assertTrue(board.is_given(row, col))
+                self.assertEqual(board.get_solution_value(row, col), value)
+        self.assertTrue(board.solve("dlx"))
+        self.assertTrue(board.check_win())
+
+        self.assertTrue(self.pool.wait_until_full(timeout=30))
+        self.assertEqual(self.pool.ready_count("hard"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,296 @@
+import bisect
+import json
+import random
+import sqlite3
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import config
+import scoreboard
+from tests.scoreboard_writers import run_writers
+
+PATCHED_FUNCTIONS = ("_score_path", "_db_path", "_read_journal_entries", "_load_snapshot")
+PATCHED_CONFIG = ("SCOREBOARD_BACKEND", "SCOREBOARD_BATCH_SIZE", "SCOREBOARD_JOURNAL_MAX_BYTES")
+
+
+class ScoreboardTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / config.SCOREBOARD_FILE
+        self.db_path = Path(self._tmp.name) / config.SCOREBOARD_DB_FILE
+        self._functions = {name: getattr(scoreboard, name) for name in PATCHED_FUNCTIONS}
+        self._config = {name: getattr(config, name) for name in PATCHED_CONFIG}
+        scoreboard._score_path = lambda: self.path
+        scoreboard._db_path = lambda: self.db_path
+        scoreboard._pending.clear()
+        scoreboard._cache.invalidate()
+
+    def tearDown(self):
+        scoreboard.close_databases()
+        for name, value in self._functions.items():
+            setattr(scoreboard, name, value)
+        for name, value in self._config.items():
+            setattr(config, name, value)
+        scoreboard._pending.clear()
+        scoreboard._cache.invalidate()
+        self._tmp.cleanup()
+
+
+class TestScoreboardJournal(ScoreboardTestCase):
+    def test_updates_are_appended_and_replayed(self):
+        scoreboard.update_score("Ada", 10)
+        scoreboard.update_score("Bob", 5)
+        scoreboard.update_score("ADA", 30)
+        self.assertFalse(self.path.exists())
+        self.assertEqual(len(scoreboard._journal_path().read_bytes().splitlines()), 3)
+        self.assertEqual(
+            scoreboard.load_scores(),
+            [{"name": "ada", "score": 30}, {"name": "bob", "score": 5}],
+        )
+
+    def test_update_does_not_read_the_snapshot(self):
+        scoreboard.save_scores([{"name": f"p{index}", "score": index} for index in range(50)])
+        scoreboard._load_snapshot = None
+        scoreboard.update_score("new", 1)
+        scoreboard._load_snapshot = self._functions["_load_snapshot"]
+        self.assertEqual(len(scoreboard.load_scores()), 51)
+
+    def test_torn_journal_tail_is_skipped_and_next_append_survives(self):
+        scoreboard.update_score("ada", 10)
+        with scoreboard._journal_path().open("ab") as file_handle:
+            file_handle.write(b'{"name":"bob","sco')
+        self.assertEqual(scoreboard.load_scores(), [{"name": "ada", "score": 10}])
+        scoreboard.update_score("cy", 7)
+        self.assertEqual(
+            scoreboard.load_scores(),
+            [{"name": "ada", "score": 10}, {"name": "cy", "score": 7}],
+        )
+
+    def test_compaction_writes_snapshot_and_empties_journal(self):
+        config.SCOREBOARD_JOURNAL_MAX_BYTES = 100
+        for index in range(6):
+            scoreboard.update_score(f"player{index}", index)
+        with self.path.open(encoding="utf-8") as file_handle:
+            snapshot = json.load(file_handle)
+        journal = scoreboard._journal_path().read_bytes()
+        self.assertLessEqual(len(journal), 100)
+        self.assertFalse(self.path.with_name(self.path.name + ".tmp").exists())
+        self.assertEqual(len(snapshot) + len(journal.splitlines()), 6)
+        self.assertEqual([entry["score"] for entry in scoreboard.load_scores()], list(range(6)))
+
+    def test_replay_after_interrupted_compaction_is_idempotent(self):
+        scoreboard.update_score("ada", 10)
+        scoreboard.update_score("ada", 12)
+        journal = scoreboard._journal_path().read_bytes()
+        scoreboard.compact()
+        scoreboard._journal_path().write_bytes(journal)
+        self.assertEqual(scoreboard.load_scores(), [{"name": "ada", "score": 12}])
+
+    def test_corrupt_snapshot_keeps_journal_entries(self):
+        self.path.write_text("[{\"name\": \"ada\", \"sco", encoding="utf-8")
+        scoreboard.update_score("bob", 3)
+        self.assertEqual(scoreboard.get_leaderboard(), [{"name": "bob", "score": 3}])
+
+
+class TestLeaderboardCache(ScoreboardTestCase):
+    def setUp(self):
+        super().setUp()
+        read = scoreboard._read_journal_entries
+        self.reads = 0
+
+        def counting_read():
+            self.reads += 1
+            return read()
+
+        scoreboard._read_journal_entries = counting_read
+
+    def test_sorted_ranking_matches_a_sorted_list(self):
+        rng = random.Random(3)
+        expected = sorted(rng.sample(range(1000), 50))
+        ranking = scoreboard.SortedRanking(expected, bucket_size=4)
+        for _ in range(500):
+            if expected and rng.random() < 0.5:
+                item = expected.pop(rng.randrange(len(expected)))
+                ranking.remove(item)
+            else:
+                item = rng.randrange(1000)
+                if item in expected:
+                    continue
+                bisect.insort(expected, item)
+                ranking.add(item)
+            start = rng.randrange(len(expected) + 1)
+            self.assertEqual(ranking.slice(start, start + 10), expected[start:start + 10])
+            probe = rng.randrange(1001)
+            self.assertEqual(ranking.index(probe), bisect.bisect_left(expected, probe))
+        self.assertEqual(len(ranking), len(expected))
+        self.assertEqual(ranking.slice(0), expected)
+
+    def test_repeated_reads_and_own_updates_hit_the_cache(self):
+        scoreboard.save_scores([{"name": "ada", "score": 5}, {"name": "bob", "score": 7}])
+        self.assertEqual(scoreboard.get_leaderboard(1), [{"name": "bob", "score": 7}])
+        scoreboard.update_score("Ada", 9)
+        scoreboard.update_score("cy", 6)
+        leaderboard = scoreboard.get_leaderboard()
+        scoreboard.load_scores()
+        self.assertEqual(self.reads, 1)
+        self.assertEqual([entry["name"] for entry in leaderboard], ["ada", "bob", "cy"])
+        scoreboard._cache.invalidate()
+        self.assertEqual(scoreboard.get_leaderboard(), leaderboard)
+
+    def test_external_writes_invalidate_the_cache(self):
+        scoreboard.update_score("ada", 5)
+        scoreboard.get_leaderboard()
+        with scoreboard._journal_path().open("ab") as file_handle:
+            file_handle.write(b'{"name":"bob","score":8}\n')
+        self.assertEqual(scoreboard.get_leaderboard(1), [{"name": "bob", "score": 8}])
+        scoreboard.update_score("cy", 9)
+        self.assertEqual(len(scoreboard.get_leaderboard()), 3)
+        self.path.write_text('[{"name": "dee", "score": 1}]', encoding="utf-8")
+        self.assertIn({"name": "dee", "score": 1}, scoreboard.load_scores())
+
+    def test_pages_are_fetched_lazily_and_ranks_found(self):
+        scoreboard.save_scores([{"name": f"P{index}", "score": index} for index in range(250)])
+        pages = scoreboard.LeaderboardPages(page_size=100)
+        self.assertEqual((len(pages), pages.fetches), (250, 0))
+        self.assertEqual(pages[0], {"name": "P249", "score": 249})
+        self.assertEqual(pages[99]["score"], 150)
+        self.assertEqual(pages.fetches, 1)
+        self.assertEqual(pages[249], {"name": "P0", "score": 0})
+        self.assertEqual(pages.fetches, 2)
+        self.assertEqual(pages.find("p200"), 49)
+        self.assertIsNone(pages.find("nobody"))
+
+    def test_find_refreshes_pages_after_another_writer_appends(self):
+        scoreboard.save_scores([{"name": f"p{index}", "score": index} for index in range(5)])
+        pages = scoreboard.LeaderboardPages(page_size=2)
+        self.assertEqual(pages[0]["name"], "p4")
+        with scoreboard._journal_path().open("ab") as file_handle:
+            file_handle.write(b'{"name":"new","score":99}\n')
+        self.assertEqual(pages.find("new"), 0)
+        self.assertEqual(len(pages), 6)
+        self.assertEqual(pages[0], {"name": "new", "score": 99})
+
+    def test_returned_entries_do_not_alias_the_cache(self):
+        scoreboard.update_score("ada", 5)
+        scoreboard.get_leaderboard()[0]["score"] = 100
+        scoreboard.load_scores()[0]["score"] = 100
+        self.assertEqual(scoreboard.get_leaderboard(), [{"name": "ada", "score": 5}])
+
+
+class TestScoreboardLocking(ScoreboardTestCase):
+    @unittest.skipIf(scoreboard.fcntl is None, "fcntl is not available")
+    def test_held_lock_times_out_after_retries(self):
+        with scoreboard.FileLock(scoreboard._lock_path()):
+            lock = scoreboard.FileLock(scoreboard._lock_path(), exclusive=False, timeout=0.05)
+            with self.assertRaises(scoreboard.LockTimeout):
+                lock.__enter__()
+            self.assertGreater(lock.retries, 0)
+        with scoreboard.FileLock(scoreboard._lock_path(), exclusive=False):
+            with scoreboard.FileLock(scoreboard._lock_path(), exclusive=False, timeout=0):
+                pass
+
+    @unittest.skipIf(scoreboard.fcntl is None, "fcntl is not available")
+    def test_busy_lock_keeps_the_score_pending(self):
+        pages = scoreboard.LeaderboardPages(timeout=0.02)
+        with scoreboard.FileLock(scoreboard._lock_path()):
+            with self.assertRaises(scoreboard.LockTimeout):
+                scoreboard.update_score("ada", 5, timeout=0.02)
+            self.assertEqual(scoreboard.pending(), 1)
+            self.assertIsNone(pages[0])
+            self.assertIsNone(pages.find("ada"))
+        self.assertEqual(scoreboard.flush(), 1)
+        self.assertEqual(scoreboard.pending(), 0)
+        self.assertEqual(scoreboard.load_scores(), [{"name": "ada", "score": 5}])
+
+    def test_batched_updates_are_coalesced_into_one_append(self):
+        config.SCOREBOARD_BATCH_SIZE = 3
+        scoreboard.update_score("ada", 1)
+        scoreboard.update_score("ada", 2)
+        scoreboard.update_score("bob", 3)
+        self.assertFalse(scoreboard._journal_path().exists())
+        scoreboard.update_score("cy", 4)
+        self.assertEqual(len(scoreboard._journal_path().read_bytes().splitlines()), 3)
+        scoreboard.update_score("dee", 5)
+        self.assertEqual(len(scoreboard.load_scores()), 4)
+        self.assertEqual(scoreboard.flush(), 0)
+
+    @unittest.skipIf(scoreboard.fcntl is None, "fcntl is not available")
+    def test_concurrent_writer_processes_lose_no_updates(self):
+        writers, count = 8, 30
+        for batch_size in (1, 4):
+            with tempfile.TemporaryDirectory() as tmp:
+                run_writers(tmp, writers, count, batch_size, 1024)
+                self.path = Path(tmp) / config.SCOREBOARD_FILE
+                scores = {entry["name"]: entry["score"] for entry in scoreboard.load_scores()}
+            self.assertEqual(len(scores), writers * (count + 1))
+            for writer in range(writers):
+                self.assertEqual(scores[f"last{writer}"], count - 1)
+                self.assertEqual(scores[f"w{writer}-{count - 1}"], count - 1)
+
+
+class TestScoreboardSqlite(ScoreboardTestCase):
+    def test_json_scores_are_migrated_once(self):
+        scoreboard.save_scores([{"name": "Ada", "score": 10}, {"name": "bob", "score": 4}])
+        scoreboard.update_score("bob", 12)
+        config.SCOREBOARD_BACKEND = "sqlite"
+        self.assertEqual(
+            scoreboard.load_scores(),
+            [{"name": "Ada", "score": 10}, {"name": "bob", "score": 12}],
+        )
+        scoreboard.close_databases()
+        scoreboard.update_score("cy", 1)
+        self.assertEqual(len(scoreboard.load_scores()), 3)
+
+    def test_upserts_replace_matching_names(self):
+        config.SCOREBOARD_BACKEND = "sqlite"
+        scoreboard.update_score("Ada", 10)
+        scoreboard.update_score("ADA", 3)
+        self.assertEqual(scoreboard.load_scores(), [{"name": "ada", "score": 3}])
+        self.assertEqual(scoreboard._database().count(), 1)
+
+    def test_top_k_matches_the_journal_backend(self):
+        scores = [("ada", 5), ("Bob", 9), ("cy", 5), ("dee", 1), ("Eve", 9)]
+        for name, score in scores:
+            scoreboard.update_score(name, score)
+        expected = scoreboard.get_leaderboard(3)
+        self.assertEqual(expected, scoreboard.get_leaderboard()[:3])
+        config.SCOREBOARD_BACKEND = "sqlite"
+        self.assertEqual(scoreboard.get_leaderboard(3), expected)
+        self.assertEqual(len(scoreboard.get_leaderboard()), 5)
+
+    def test_pages_and_ranks_match_the_journal_backend(self):
+        for index in range(30):
+            scoreboard.update_score(f"p{index}", index % 7)
+        expected = scoreboard.get_leaderboard_page(10, 10)
+        ranks = [scoreboard.find_rank(f"p{index}") for index in range(30)]
+        config.SCOREBOARD_BACKEND = "sqlite"
+        self.assertEqual(scoreboard.get_leaderboard_page(10, 10), expected)
+        self.assertEqual([scoreboard.find_rank(f"P{index}") for index in range(30)], ranks)
+        self.assertEqual(scoreboard.leaderboard_size(), 30)
+        self.assertIsNone(scoreboard.find_rank("nobody"))
+
+    def test_busy_database_times_out_and_keeps_the_score_pending(self):
+        config.SCOREBOARD_BACKEND = "sqlite"
+        scoreboard.update_score("ada", 1)
+        other = sqlite3.connect(self.db_path, isolation_level=None)
+        self.addCleanup(other.close)
+        other.execute("BEGIN IMMEDIATE")
+        started = time.monotonic()
+        with self.assertRaises(scoreboard.LockTimeout):
+            scoreboard.update_score("bob", 2, timeout=0.05)
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(scoreboard.pending(), 1)
+        other.execute("COMMIT")
+        self.assertEqual(scoreboard.flush(0.05), 1)
+        self.assertEqual(scoreboard.find_rank("bob"), 0)
+
+    def test_unknown_backend_is_rejected(self):
+        config.SCOREBOARD_BACKEND = "csv"
+        with self.assertRaises(ValueError):
+            scoreboard.load_scores()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+import sudoku
+from benchmarks import solver_suite
+from sudoku import SudokuBoard, get_solver, register_solver
+
+
+class TestSolverSuite(unittest.TestCase):
+    def test_adversarial_puzzles_have_unique_solutions(self):
+        solver = get_solver("dlx")
+        for name, text in solver_suite.ADVERSARIAL.items():
+            board = SudokuBoard()
+            board.load_puzzle(solver_suite.parse_grid(text))
+            self.assertEqual(solver.count_solutions(board, 2), 1, name)
+
+    def test_corpus_is_reproducible(self):
+        first = solver_suite.build_corpus(seed=4, count=1)
+        second = solver_suite.build_corpus(seed=4, count=1)
+        self.assertEqual(first, second)
+        self.assertIn("adversarial/brute_force", first)
+
+    def test_budget_exhaustion_is_counted_not_raised(self):
+        grids = [solver_suite.parse_grid(solver_suite.ADVERSARIAL["brute_force"])]
+        totals = solver_suite.solve_all("backtracking", grids, max_nodes=100)
+        self.assertEqual(totals["budget"], 1)
+        self.assertEqual(totals["nodes"], 101)
+
+    def test_unmeasured_metrics_are_omitted(self):
+        class Bare:
+            def solve(self, board):
+                return True
+
+        register_solver("bare", Bare())
+        self.addCleanup(sudoku._SOLVERS.pop, "bare")
+        grids = [solver_suite.parse_grid(solver_suite.ADVERSARIAL["escargot"])]
+        self.assertEqual(solver_suite.solve_all("bare", grids, max_nodes=10), {"budget": 0})
+        mrv = solver_suite.solve_all("mrv", grids, max_nodes=None)
+        self.assertEqual(set(mrv), {"nodes", "backtracks", "propagated", "budget"})
+        self.assertGreater(mrv["nodes"], mrv["propagated"])
+
+    def test_rank_orders_by_budget_failures_then_time(self):
+        rows = {
+            "solve/slow/easy": {"ms": 9.0, "nodes": 10, "budget": 0},
+            "solve/fast/easy": {"ms": 1.0, "nodes": 10, "budget": 1},
+            "solve/steady/easy": {"ms": 5.0, "nodes": 10, "budget": 0},
+        }
+        ranking = solver_suite.rank(rows, ["slow", "fast", "steady", "missing"])
+        self.assertEqual([row[-1] for row in ranking], ["steady", "slow", "fast"])
+        flat = solver_suite.flatten({"fill_board": {"ms": 1.5, "peak_kib": 2.0}})
+        self.assertEqual(flat, {"fill_board.ms": 1.5, "fill_board.peak_kib": 2.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
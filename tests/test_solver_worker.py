@@ -0,0 +1,97 @@
+import time
+import unittest
+
+import solver_worker
+from sudoku import NodeBudgetExceeded, SudokuBoard
+
+ANTI_BACKTRACKING = (
+    "..............3.85..1.2.......5.7....."
+    "4...1...9.......5......73..2.1........4...9"
+)
+BRANCHING = (
+    "8..........36......7..9.2...5...7......."
+    "457.....1...3...1....68..85...1..9....4.."
+)
+
+
+def parse(puzzle):
+    return [0 if char == "." else int(char) for char in puzzle]
+
+
+def wait_for(job, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = job.poll()
+        if result is not None:
+            return result
+        time.sleep(0.01)
+    job.cancel()
+    raise AssertionError("solver job did not finish")
+
+
+class TestNodeBudget(unittest.TestCase):
+    def test_budget_restores_board(self):
+        for method in ("backtracking", "mrv", "dlx"):
+            board = SudokuBoard()
+            board.load_puzzle(parse(BRANCHING))
+            before = board.snapshot()
+            with self.assertRaises(NodeBudgetExceeded):
+                board.solve(method, max_nodes=5)
+            self.assertEqual(board.snapshot(), before)
+            self.assertEqual(board.last_solve_stats.nodes, 6)
+
+
+class TestSolveJob(unittest.TestCase):
+    def test_solves_in_worker(self):
+        grid = parse(ANTI_BACKTRACKING)
+        job = solver_worker.SolveJob(
+            grid, method="dlx", time_budget=30, max_nodes=None, inline_nodes=0
+        )
+        result = wait_for(job)
+        self.assertEqual(result.status, solver_worker.SOLVED)
+        self.assertGreater(result.nodes, 0)
+
+        board = SudokuBoard()
+        board.load_puzzle(grid)
+        board.fill_from(result.grid)
+        self.assertTrue(board.check_win())
+
+    def test_easy_puzzles_finish_inline_without_a_process(self):
+        job = solver_worker.SolveJob(parse(ANTI_BACKTRACKING), method="dlx")
+        self.assertIsNone(job._process)
+        self.assertFalse(job.running())
+        self.assertEqual(job.poll().status, solver_worker.SOLVED)
+
+        job = solver_worker.SolveJob(parse(ANTI_BACKTRACKING), method="backtracking")
+        self.assertIsNotNone(job._process)
+        self.assertEqual(job.cancel().status, solver_worker.CANCELLED)
+
+    def test_reports_no_solution(self):
+        grid = [0] * 81
+        grid[0] = grid[1] = 5
+        result = wait_for(solver_worker.SolveJob(grid, method="mrv"))
+        self.assertEqual(result.status, solver_worker.NO_SOLUTION)
+
+    def test_node_budget(self):
+        job = solver_worker.SolveJob(
+            parse(ANTI_BACKTRACKING), method="backtracking", max_nodes=100
+        )
+        self.assertEqual(wait_for(job).status, solver_worker.NODE_BUDGET)
+
+    def test_timeout_and_cancel(self):
+        job = solver_worker.SolveJob(
+            parse(ANTI_BACKTRACKING), method="backtracking", time_budget=0.2, max_nodes=None
+        )
+        self.assertEqual(wait_for(job).status, solver_worker.TIMED_OUT)
+
+        job = solver_worker.SolveJob(
+            parse(ANTI_BACKTRACKING), method="backtracking", time_budget=None, max_nodes=None
+        )
+        self.assertTrue(job.running())
+        self.assertEqual(job.cancel().status, solver_worker.CANCELLED)
+        self.assertFalse(job.running())
+        self.assertEqual(job.poll().status, solver_worker.CANCELLED)
+
+
+if __name__ == "__main__":
+    unittest.main()
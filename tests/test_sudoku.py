@@ -0,0 +1,270 @@
+import random
+import unittest
+
+from sudoku import NEIGHBORS, SudokuBoard, get_solver
+
+ANTI_BACKTRACKING = (
+    "..............3.85..1.2.......5.7....."
+    "4...1...9.......5......73..2.1........4...9"
+)
+
+
+def load_puzzle(board, puzzle):
+    for index, char in enumerate(puzzle):
+        if char != ".":
+            board.set_value(index // 9, index % 9, int(char))
+
+
+def neighbor_scan_is_valid(board, row, col, num):
+    for neighbor in board.graph[(row, col)]:
+        if board.get_value(*neighbor) == num:
+            return False
+    return True
+
+
+def scan_check_win(board):
+    for (row, col), value in board.values.items():
+        if value == 0 or not neighbor_scan_is_valid(board, row, col, value):
+            return False
+    return True
+
+
+def scan_conflicts(board):
+    return {
+        (row, col)
+        for (row, col), value in board.values.items()
+        if value and not neighbor_scan_is_valid(board, row, col, value)
+    }
+
+
+class TestSudokuBoard(unittest.TestCase):
+    def test_is_valid_matches_neighbor_scan(self):
+        rng = random.Random(7)
+        board = SudokuBoard()
+        for _ in range(400):
+            row, col = rng.randrange(9), rng.randrange(9)
+            board.set_value(row, col, rng.randrange(10))
+            for num in range(10):
+                for check_row, check_col in ((row, col), (rng.randrange(9), rng.randrange(9))):
+                    self.assertEqual(
+                        board.is_valid(check_row, check_col, num),
+                        neighbor_scan_is_valid(board, check_row, check_col, num),
+                    )
+
+    def test_incremental_win_and_conflicts_match_scan(self):
+        rng = random.Random(19)
+        board = SudokuBoard()
+        board.generate("easy")
+        solution = dict(board.solution)
+        for _ in range(600):
+            row, col = rng.randrange(9), rng.randrange(9)
+            choice = rng.random()
+            if choice < 0.6:
+                value = solution[(row, col)]
+            elif choice < 0.8:
+                value = rng.randrange(1, 10)
+            else:
+                value = 0
+            board.set_value(row, col, value)
+            self.assertEqual(board.check_win(), scan_check_win(board))
+            self.assertEqual(board.get_conflicts(), scan_conflicts(board))
+            self.assertEqual(
+                board.filled_count(),
+                sum(1 for value in board.values.values() if value),
+            )
+        for (row, col), value in solution.items():
+            board.set_value(row, col, value)
+        self.assertTrue(board.check_win())
+        self.assertEqual(board.conflict_count(), 0)
+
+    def test_candidates_follow_moves(self):
+        board = SudokuBoard()
+        self.assertEqual(board.get_candidates(0, 0), list(range(1, 10)))
+        self.assertTrue(board.make_move(0, 8, 3))
+        self.assertTrue(board.make_move(8, 0, 4))
+        self.assertTrue(board.make_move(1, 1, 5))
+        self.assertEqual(board.get_candidates(0, 0), [1, 2, 6, 7, 8, 9])
+        self.assertFalse(board.make_move(0, 0, 5))
+        self.assertTrue(board.clear_value(1, 1))
+        self.assertEqual(board.get_candidates(0, 0), [1, 2, 5, 6, 7, 8, 9])
+
+    def test_duplicate_digits_survive_partial_clear(self):
+        board = SudokuBoard()
+        board.set_value(0, 0, 5)
+        board.set_value(0, 1, 5)
+        self.assertFalse(board.is_valid(0, 0, 5))
+        board.set_value(0, 1, 0)
+        self.assertTrue(board.is_valid(0, 0, 5))
+        self.assertFalse(board.is_valid(0, 2, 5))
+
+    def test_generate_and_solve(self):
+        random.seed(3)
+        board = SudokuBoard()
+        self.assertTrue(board.generate("hard"))
+        self.assertFalse(board.check_win())
+        self.assertTrue(board.solve())
+        self.assertTrue(board.check_win())
+
+    def test_mrv_solver_matches_backtracking(self):
+        random.seed(11)
+        source = SudokuBoard()
+        source.generate("medium")
+        puzzle = dict(source.values)
+
+        results = {}
+        for method in ("backtracking", "mrv"):
+            board = SudokuBoard()
+            for (row, col), value in puzzle.items():
+                board.set_value(row, col, value)
+            self.assertTrue(board.solve(method))
+            self.assertTrue(board.check_win())
+            self.assertEqual(board.last_solve_stats.method, method)
+            results[method] = board.last_solve_stats
+        self.assertLessEqual(results["mrv"].nodes, results["backtracking"].nodes)
+
+    def test_mrv_solves_anti_backtracking_puzzle(self):
+        board = SudokuBoard()
+        load_puzzle(board, ANTI_BACKTRACKING)
+        self.assertTrue(board.solve("mrv"))
+        self.assertTrue(board.check_win())
+        self.assertLess(board.last_solve_stats.nodes, 1000)
+
+    def test_mrv_rejects_conflicting_board(self):
+        board = SudokuBoard()
+        board.set_value(0, 0, 5)
+        board.set_value(0, 1, 5)
+        self.assertFalse(board.solve("mrv"))
+        self.assertEqual(board.get_value(0, 2), 0)
+
+    def test_mrv_restores_board_without_solution(self):
+        board = SudokuBoard()
+        for col, value in enumerate([1, 2, 3, 4, 5, 6, 7, 8]):
+            board.set_value(0, col, value)
+        board.set_value(1, 8, 9)
+        before = dict(board.values)
+        self.assertFalse(board.solve("mrv"))
+        self.assertEqual(board.values, before)
+
+    def test_unknown_solver_method(self):
+        with self.assertRaises(ValueError):
+            SudokuBoard().solve("guess")
+
+    def test_unique_generation(self):
+        random.seed(5)
+        board = SudokuBoard()
+        for difficulty in ("easy", "medium", "hard"):
+            self.assertTrue(board.generate(difficulty, unique=True))
+            stats = board.last_generate_stats
+            self.assertEqual(stats.difficulty, difficulty)
+            self.assertTrue(stats.unique)
+            self.assertLessEqual(stats.solver_calls, 8 * stats.removed)
+            self.assertEqual(81 - len(board.givens), stats.removed)
+            self.assertEqual(get_solver("dlx").count_solutions(board, 2), 1)
+
+    def test_default_generation_skips_solver_calls(self):
+        random.seed(5)
+        board = SudokuBoard()
+        board.generate("hard")
+        self.assertEqual(board.last_generate_stats.solver_calls, 0)
+        self.assertEqual(board.last_generate_stats.removed, 50)
+        self.assertGreaterEqual(board.last_generate_stats.nodes, 81)
+        self.assertEqual(
+            board.last_generate_stats.nodes - board.last_generate_stats.backtracks, 81
+        )
+
+    def test_neighbor_table_is_shared(self):
+        self.assertIs(SudokuBoard().graph, SudokuBoard().graph)
+        self.assertEqual(len(NEIGHBORS), 81)
+        self.assertTrue(all(len(neighbors) == 20 for neighbors in NEIGHBORS))
+        self.assertEqual(
+            SudokuBoard().graph[(4, 4)],
+            {(index // 9, index % 9) for index in NEIGHBORS[40]},
+        )
+        with self.assertRaises(AttributeError):
+            SudokuBoard().extra = 1
+
+    def test_copy_and_snapshot_are_independent(self):
+        random.seed(23)
+        board = SudokuBoard()
+        board.generate("medium")
+        clone = board.copy()
+        snapshot = board.snapshot()
+        self.assertEqual(clone.values, board.values)
+        self.assertEqual(clone.givens, board.givens)
+
+        row, col = next(node for node, value in board.values.items() if value == 0)
+        value = board.get_candidates(row, col)[0]
+        self.assertTrue(clone.make_move(row, col, value))
+        self.assertEqual(board.get_value(row, col), 0)
+        self.assertEqual(board.get_candidates(row, col)[0], value)
+
+        board.solve("dlx")
+        self.assertTrue(board.check_win())
+        board.restore(snapshot)
+        self.assertFalse(board.check_win())
+        self.assertEqual(board.snapshot(), snapshot)
+        self.assertEqual(board.filled_count(), len(board.givens))
+        self.assertTrue(board.solve("mrv"))
+
+    def test_stepwise_solver_yields_each_assignment(self):
+        board = SudokuBoard()
+        load_puzzle(board, ANTI_BACKTRACKING)
+        stepper = board.solve_stepwise()
+        self.assertEqual(stepper.advance(max_steps=10), 10)
+        self.assertFalse(stepper.done)
+        self.assertEqual(stepper.progress.assignments + stepper.progress.backtracks, 10)
+
+        kinds = {"assign": 0, "backtrack": 0}
+        for step in board.iter_solve_steps(stepper.progress):
+            kinds[step.kind] += 1
+            if step.kind == "assign":
+                self.assertEqual(board.get_value(step.row, step.col), step.value)
+            else:
+                self.assertEqual(board.get_value(step.row, step.col), 0)
+            if sum(kinds.values()) >= 200:
+                break
+        self.assertGreater(kinds["backtrack"], 0)
+
+    def test_stepwise_solver_fast_forward_and_cancel(self):
+        board = SudokuBoard()
+        load_puzzle(board, ANTI_BACKTRACKING)
+        before = board.snapshot()
+
+        stepper = board.solve_stepwise()
+        stepper.advance(budget_ms=1)
+        stepper.cancel()
+        self.assertTrue(stepper.done)
+        self.assertEqual(board.snapshot(), before)
+
+        stepper = board.solve_stepwise()
+        stepper.finish()
+        progress = stepper.progress
+        self.assertTrue(progress.done)
+        self.assertTrue(progress.solved)
+        self.assertTrue(board.check_win())
+        self.assertGreater(progress.backtracks, 0)
+        self.assertGreater(progress.assignments, progress.backtracks)
+        self.assertGreaterEqual(progress.max_depth, progress.depth)
+
+    def test_stepwise_solver_reports_unsolvable(self):
+        board = SudokuBoard()
+        for col, value in enumerate([1, 2, 3, 4, 5, 6, 7, 8]):
+            board.set_value(0, col, value)
+        board.set_value(1, 8, 9)
+        before = board.snapshot()
+        stepper = board.solve_stepwise()
+        stepper.finish()
+        self.assertTrue(stepper.done)
+        self.assertFalse(stepper.progress.solved)
+        self.assertEqual(board.snapshot(), before)
+
+    def test_reset_clears_masks(self):
+        board = SudokuBoard()
+        board.generate("easy")
+        board.reset()
+        self.assertEqual(board.get_candidates(4, 4), list(range(1, 10)))
+        self.assertFalse(board.is_valid(4, 4, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,311 @@
+import os
+import random
+import unittest
+
+from sudoku import SolveProgress, SudokuBoard
+
+try:
+    import pygame
+
+    import config
+    import profiler
+    import ui
+except ImportError:
+    pygame = None
+
+
+class FakeFont:
+    def __init__(self):
+        self.calls = 0
+
+    def render(self, text, antialias, color):
+        self.calls += 1
+        return (text, color, self.calls)
+
+    def size(self, text):
+        return len(text) * 10, 10
+
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class TestTextCache(unittest.TestCase):
+    def test_repeated_text_is_rendered_once(self):
+        cache = ui.TextCache(8)
+        font = FakeFont()
+        first = cache.render(font, "5", (0, 0, 0))
+        second = cache.render(font, "5", (0, 0, 0))
+        self.assertIs(first, second)
+        self.assertEqual(font.calls, 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_color_is_part_of_the_key(self):
+        cache = ui.TextCache(8)
+        font = FakeFont()
+        cache.render(font, "5", (0, 0, 0))
+        cache.render(font, "5", (255, 0, 0))
+        self.assertEqual(font.calls, 2)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ui.TextCache(2)
+        font = FakeFont()
+        cache.render(font, "a", (0, 0, 0))
+        cache.render(font, "b", (0, 0, 0))
+        cache.render(font, "a", (0, 0, 0))
+        cache.render(font, "c", (0, 0, 0))
+        self.assertEqual(len(cache), 2)
+        cache.render(font, "a", (0, 0, 0))
+        self.assertEqual(font.calls, 3)
+        cache.render(font, "b", (0, 0, 0))
+        self.assertEqual(font.calls, 4)
+
+    def test_zero_size_disables_caching(self):
+        cache = ui.TextCache(0)
+        font = FakeFont()
+        cache.render(font, "5", (0, 0, 0))
+        cache.render(font, "5", (0, 0, 0))
+        self.assertEqual(font.calls, 2)
+        self.assertEqual(len(cache), 0)
+
+    def test_prebuild_covers_digits_in_each_text_color(self):
+        cache = ui.TextCache(64)
+        font = FakeFont()
+        theme = {"given_text": (1, 1, 1), "user_text": (2, 2, 2), "conflict_text": (3, 3, 3)}
+        cache.prebuild({"cell": font}, theme)
+        self.assertEqual(len(cache), 27)
+        cache.render(font, "9", (3, 3, 3))
+        self.assertEqual(font.calls, 27)
+
+    def test_prebuilt_digits_are_never_evicted(self):
+        cache = ui.TextCache(2)
+        font = FakeFont()
+        theme = {"given_text": (1, 1, 1), "user_text": (2, 2, 2), "conflict_text": (3, 3, 3)}
+        cache.prebuild({"cell": font}, theme)
+        for index in range(10):
+            cache.render(font, f"Depth: {index}", (0, 0, 0))
+        self.assertEqual(len(cache), 29)
+        calls = font.calls
+        cache.render(font, "5", (2, 2, 2))
+        self.assertEqual(font.calls, calls)
+
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class TestActivityLog(unittest.TestCase):
+    def test_oldest_messages_are_dropped(self):
+        activity_log = ui.ActivityLog(3)
+        for index in range(5):
+            ui.log_message(activity_log, f"message {index}")
+        self.assertEqual(list(activity_log), ["message 2", "message 3", "message 4"])
+        self.assertEqual(activity_log[-1], "message 4")
+        self.assertEqual(activity_log.version, 5)
+
+    def test_lines_are_wrapped_once_per_font_width_and_color(self):
+        activity_log = ui.ActivityLog()
+        activity_log.append("one two three")
+        activity_log.append("four")
+        font = FakeFont()
+        first = [
+            [surface[0] for surface in surfaces]
+            for surfaces in activity_log.iter_lines(font, 80, (0, 0, 0))
+        ]
+        self.assertEqual(first, [["four"], ["one two", "three"]])
+        calls = font.calls
+        list(activity_log.iter_lines(font, 80, (0, 0, 0)))
+        self.assertEqual(font.calls, calls)
+        self.assertEqual((activity_log.hits, activity_log.misses), (2, 2))
+        list(activity_log.iter_lines(font, 200, (0, 0, 0)))
+        self.assertEqual(activity_log.misses, 4)
+
+    def test_clear_bumps_version(self):
+        activity_log = ui.ActivityLog()
+        activity_log.append("hello")
+        activity_log.clear()
+        self.assertEqual(len(activity_log), 0)
+        self.assertEqual(activity_log.version, 2)
+
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class TestStaticLayer(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        self.fonts = {name: pygame.font.Font(None, 24) for name in ("counter", "cell", "console")}
+        self.screen = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        self.buttons = ui.create_buttons()
+
+    def test_layer_is_built_once_per_theme(self):
+        layer = ui.StaticLayer()
+        light, dark = config.THEMES["light"], config.THEMES["dark"]
+        for _ in range(3):
+            layer.draw(self.screen, self.fonts, self.buttons, light)
+        self.assertEqual(layer.builds, 1)
+        layer.draw(self.screen, self.fonts, self.buttons, dark)
+        self.assertEqual(layer.builds, 2)
+        layer.invalidate()
+        layer.draw(self.screen, self.fonts, self.buttons, dark)
+        self.assertEqual(layer.builds, 3)
+
+    def test_layout_change_rebuilds_layer(self):
+        layer = ui.StaticLayer()
+        theme = config.THEMES["light"]
+        layer.draw(self.screen, self.fonts, self.buttons, theme)
+        self.buttons["easy"] = self.buttons["easy"].move(0, 10)
+        layer.draw(self.screen, self.fonts, self.buttons, theme)
+        self.assertEqual(layer.builds, 2)
+
+    def test_blit_matches_direct_drawing(self):
+        theme = config.THEMES["dark"]
+        direct = self.screen.copy()
+        ui.draw_static_layer(direct, self.fonts, self.buttons, theme)
+        ui.StaticLayer().draw(self.screen, self.fonts, self.buttons, theme)
+        self.assertEqual(
+            pygame.image.tostring(direct, "RGB"), pygame.image.tostring(self.screen, "RGB")
+        )
+
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class TestDirtyRenderer(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        self.fonts = {name: pygame.font.Font(None, 24) for name in ("counter", "cell", "console")}
+        self.screen = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        self.buttons = ui.create_buttons()
+        self.theme = config.THEMES["light"]
+        self.board = SudokuBoard(rng=random.Random(4))
+        self.board.generate("easy")
+
+    def full_frame(self, selected_cell, move_count, messages, hovered, progress=None):
+        reference = self.screen.copy()
+        ui.draw_background(reference, self.fonts, self.buttons, self.theme)
+        ui.draw_grid(reference, self.board, selected_cell, self.fonts, self.theme)
+        ui.draw_move_counter(reference, self.fonts, move_count, 0, self.theme)
+        if progress is not None:
+            ui.draw_solver_progress(reference, self.fonts, progress, self.theme)
+        ui.draw_console(reference, self.fonts, messages, self.theme)
+        ui.draw_button_hover(reference, self.buttons, hovered, self.theme)
+        return pygame.image.tostring(reference, "RGB")
+
+    def test_partial_frames_match_full_redraws(self):
+        renderer = ui.DirtyRenderer()
+        messages = ui.ActivityLog()
+        row, col = divmod(self.board.to_grid().index(0), 9)
+        progress = SolveProgress(assignments=3, backtracks=1, depth=2)
+        frames = [
+            ((0, 0), 0, None, None),
+            ((0, 0), 0, None, None),
+            ((row, col), 0, "easy", None),
+            ((row, col), 1, "solve", progress),
+            ((row, col), 1, None, None),
+        ]
+        for index, (selected_cell, move_count, hovered, step_progress) in enumerate(frames):
+            if index == 3:
+                self.board.make_move(row, col, 5)
+                ui.log_message(messages, "Valid move!")
+            dirty = renderer.render(
+                self.screen,
+                self.board,
+                self.fonts,
+                self.buttons,
+                self.theme,
+                selected_cell,
+                None,
+                move_count,
+                0,
+                step_progress,
+                messages,
+                hovered,
+            )
+            if index == 1:
+                self.assertEqual(dirty, [])
+            expected = self.full_frame(selected_cell, move_count, messages, hovered, step_progress)
+            self.assertEqual(pygame.image.tostring(self.screen, "RGB"), expected)
+        self.assertEqual(renderer.full_redraws, 1)
+
+    def test_theme_change_forces_full_redraw(self):
+        renderer = ui.DirtyRenderer()
+        renderer.render(self.screen, self.board, self.fonts, self.buttons, self.theme)
+        dirty = renderer.render(
+            self.screen, self.board, self.fonts, self.buttons, config.THEMES["dark"]
+        )
+        self.assertEqual(dirty, [self.screen.get_rect()])
+        self.assertEqual(renderer.full_redraws, 2)
+
+    def test_profiler_hud_over_the_grid_matches_full_redraws(self):
+        renderer = ui.DirtyRenderer()
+        messages = ui.ActivityLog()
+        short = ["Frame profile (1 frames, ms)"]
+        tall = short + [f"stage{index}: p50 0.10  p95 0.20  max 0.40" for index in range(12)]
+        frames = [(None, (0, 0)), (tall, (0, 0)), (tall, (0, 4)), (short, (0, 4)), (None, (1, 2))]
+        for profile_lines, selected_cell in frames:
+            renderer.render(
+                self.screen,
+                self.board,
+                self.fonts,
+                self.buttons,
+                self.theme,
+                selected_cell,
+                console_messages=messages,
+                profile_lines=profile_lines,
+            )
+            expected = self.screen.copy()
+            ui.draw_background(expected, self.fonts, self.buttons, self.theme)
+            ui.draw_grid(expected, self.board, selected_cell, self.fonts, self.theme)
+            ui.draw_move_counter(expected, self.fonts, 0, 0, self.theme)
+            ui.draw_console(expected, self.fonts, messages, self.theme)
+            if profile_lines:
+                ui.draw_profiler(expected, self.fonts, profile_lines, self.theme)
+            self.assertEqual(
+                pygame.image.tostring(self.screen, "RGB"), pygame.image.tostring(expected, "RGB")
+            )
+        self.assertEqual(renderer.full_redraws, 1)
+
+    def test_profiler_gets_a_stage_per_region(self):
+        frame_profiler = profiler.FrameProfiler(enabled=True)
+        frame_profiler.begin_frame()
+        ui.DirtyRenderer().render(
+            self.screen, self.board, self.fonts, self.buttons, self.theme, profiler=frame_profiler
+        )
+        frame_profiler.end_frame()
+        self.assertEqual(
+            frame_profiler.stages(),
+            ["layer", "grid", "counter", "progress", "console", "hover", "profiler"],
+        )
+
+
+@unittest.skipIf(pygame is None, "pygame is not installed")
+class TestFramePacer(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        pygame.display.set_mode((10, 10))
+        pygame.event.clear()
+
+    def test_quiet_frames_are_idle_after_the_first_draw(self):
+        pacer = ui.FramePacer(idle_wait_ms=1)
+        pacer.next_events()
+        self.assertFalse(pacer.idle)
+        self.assertEqual(pacer.next_events(), [])
+        self.assertTrue(pacer.idle)
+        self.assertEqual((pacer.active_frames, pacer.idle_frames), (1, 1))
+
+    def test_events_animation_and_redraw_requests_are_active(self):
+        pacer = ui.FramePacer(idle_wait_ms=1)
+        pacer.next_events()
+        pygame.event.post(pygame.event.Event(pygame.USEREVENT))
+        events = pacer.next_events()
+        self.assertEqual([event.type for event in events], [pygame.USEREVENT])
+        self.assertFalse(pacer.idle)
+        pacer.next_events(animating=True)
+        self.assertFalse(pacer.idle)
+        pacer.request_redraw()
+        pacer.next_events()
+        self.assertFalse(pacer.idle)
+        self.assertEqual((pacer.active_frames, pacer.idle_frames), (4, 0))
+
+    def test_disabled_pacer_never_reports_idle(self):
+        pacer = ui.FramePacer(fps=1000, enabled=False)
+        for _ in range(3):
+            pacer.next_events()
+            self.assertFalse(pacer.idle)
+        self.assertEqual(pacer.idle_frames, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
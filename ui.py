@@ -1,7 +1,100 @@
+from collections import OrderedDict, deque
+
 import pygame
 
 import config
-import scoreboard
+
+
+class TextCache:
+    def __init__(self, max_entries=config.TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+        self._pinned = {}
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surface = self._pinned.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, True, color)
+        if self.max_entries:
+            self._surfaces[key] = surface
+            if len(self._surfaces) > self.max_entries:
+                self._surfaces.popitem(last=False)
+        return surface
+
+    def prebuild(self, fonts, theme):
+        if not self.max_entries:
+            return
+        font = fonts["cell"]
+        for color in (theme["given_text"], theme["user_text"], theme["conflict_text"]):
+            for digit in range(1, 10):
+                self._pinned[(font, str(digit), color)] = font.render(str(digit), True, color)
+
+    def clear(self):
+        self._surfaces.clear()
+        self._pinned.clear()
+
+    def __len__(self):
+        return len(self._surfaces) + len(self._pinned)
+
+
+text_cache = TextCache()
+
+
+def render_text(font, text, color):
+    return text_cache.render(font, text, color)
+
+
+def prepare_theme(fonts, theme):
+    static_layer.invalidate()
+    text_cache.clear()
+    text_cache.prebuild(fonts, theme)
+
+
+def wait_for_events(timeout_ms):
+    event = pygame.event.wait(timeout_ms)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
+
+class FramePacer:
+    def __init__(self, fps=config.FPS, idle_wait_ms=config.IDLE_WAIT_MS, enabled=config.IDLE_MODE):
+        self.fps = fps
+        self.idle_wait_ms = idle_wait_ms
+        self.enabled = enabled
+        self.clock = pygame.time.Clock()
+        self.active_frames = 0
+        self.idle_frames = 0
+        self.idle = False
+        self._redraw = True
+
+    def request_redraw(self):
+        self._redraw = True
+
+    def next_events(self, animating=False):
+        if self.enabled and not animating and not self._redraw:
+            events = wait_for_events(self.idle_wait_ms)
+        else:
+            self.clock.tick(self.fps)
+            events = pygame.event.get()
+        self.idle = self.enabled and not (events or animating or self._redraw)
+        self._redraw = False
+        if self.idle:
+            self.idle_frames += 1
+        else:
+            self.active_frames += 1
+        return events
 
 
 def get_grid_offset():
@@ -68,9 +161,7 @@ def draw_panel(screen, rect, fill_color, border_color, radius):
     pygame.draw.rect(screen, border_color, rect, 2, border_radius=radius)
 
 
-def draw_grid(screen, board, selected_cell, fonts, theme):
-    screen.fill(theme["background"])
-
+def draw_grid_panel(screen, theme):
     offset_x, offset_y = get_grid_offset()
     grid_rect = pygame.Rect(offset_x, offset_y, config.GRID_SIZE, config.GRID_SIZE)
 
@@ -106,37 +197,97 @@ def draw_grid(screen, board, selected_cell, fonts, theme):
             pygame.draw.line(screen, line_color, start_h, end_h, thickness)
             pygame.draw.line(screen, line_color, start_v, end_v, thickness)
 
+
+def draw_static_layer(screen, fonts, buttons, theme):
+    screen.fill(theme["background"])
+    draw_grid_panel(screen, theme)
+    draw_console_panel(screen, fonts, theme)
+    draw_buttons(screen, fonts, buttons, theme)
+
+
+class StaticLayer:
+    def __init__(self):
+        self.surface = None
+        self.builds = 0
+        self._key = None
+
+    def invalidate(self):
+        self._key = None
+
+    def ensure(self, screen, fonts, buttons, theme):
+        key = (
+            screen.get_size(),
+            id(theme),
+            tuple(id(font) for font in fonts.values()),
+            tuple(tuple(rect) for rect in buttons.values()),
+        )
+        if key == self._key:
+            return False
+        self.surface = pygame.Surface(screen.get_size(), 0, screen)
+        draw_static_layer(self.surface, fonts, buttons, theme)
+        self.builds += 1
+        self._key = key
+        return True
+
+    def draw(self, screen, fonts, buttons, theme):
+        self.ensure(screen, fonts, buttons, theme)
+        screen.blit(self.surface, (0, 0))
+
+    def restore(self, screen, rect):
+        screen.blit(self.surface, rect, rect)
+
+
+static_layer = StaticLayer()
+
+
+def draw_background(screen, fonts, buttons, theme):
+    static_layer.draw(screen, fonts, buttons, theme)
+
+
+def get_cell_rect(row, col):
+    offset_x, offset_y = get_grid_offset()
+    return pygame.Rect(
+        offset_x + col * config.CELL_SIZE,
+        offset_y + row * config.CELL_SIZE,
+        config.CELL_SIZE,
+        config.CELL_SIZE,
+    )
+
+
+def get_cell_color(board, row, col, conflicts):
+    if board.get_value(row, col) == 0:
+        return None
+    if (row, col) in conflicts:
+        return "conflict_text"
+    if board.is_given(row, col):
+        return "given_text"
+    return "user_text"
+
+
+def draw_cell(screen, rect, value, color, selected, highlighted, fonts, theme):
+    if value:
+        text = render_text(fonts["cell"], str(value), theme[color])
+        screen.blit(text, text.get_rect(center=rect.center))
+    if highlighted:
+        pygame.draw.rect(screen, theme["muted_text"], rect, 2, border_radius=6)
+    if selected:
+        pygame.draw.rect(screen, theme["selected"], rect, 3, border_radius=6)
+
+
+def draw_grid(screen, board, selected_cell, fonts, theme, highlight_cell=None):
+    conflicts = board.get_conflicts()
     for row in range(9):
         for col in range(9):
-            num = board.get_value(row, col)
-            if num != 0:
-                color = (
-                    theme["given_text"]
-                    if board.is_given(row, col)
-                    else theme["user_text"]
-                )
-                text = fonts["cell"].render(str(num), True, color)
-                x_pos = offset_x + col * config.CELL_SIZE
-                y_pos = offset_y + row * config.CELL_SIZE
-                text_rect = text.get_rect(
-                    center=(x_pos + config.CELL_SIZE // 2, y_pos + config.CELL_SIZE // 2)
-                )
-                screen.blit(text, text_rect)
-
-    if selected_cell:
-        sel_row, sel_col = selected_cell
-        pygame.draw.rect(
-            screen,
-            theme["selected"],
-            pygame.Rect(
-                offset_x + sel_col * config.CELL_SIZE,
-                offset_y + sel_row * config.CELL_SIZE,
-                config.CELL_SIZE,
-                config.CELL_SIZE,
-            ),
-            3,
-            border_radius=6,
-        )
+            draw_cell(
+                screen,
+                get_cell_rect(row, col),
+                board.get_value(row, col),
+                get_cell_color(board, row, col, conflicts),
+                selected_cell == (row, col),
+                highlight_cell == (row, col),
+                fonts,
+                theme,
+            )
 
 
 def draw_buttons(screen, fonts, buttons, theme):
@@ -158,7 +309,7 @@ def draw_buttons(screen, fonts, buttons, theme):
             config.BUTTON_RADIUS,
         )
         draw_panel(screen, rect, theme["button"][key], theme["panel_border"], config.BUTTON_RADIUS)
-        text = fonts["counter"].render(labels[key], True, theme["button_text"])
+        text = render_text(fonts["counter"], labels[key], theme["button_text"])
         screen.blit(
             text,
             (
@@ -168,15 +319,60 @@ def draw_buttons(screen, fonts, buttons, theme):
         )
 
 
+def get_hovered_button(buttons, pos):
+    for key, rect in buttons.items():
+        if rect.collidepoint(pos):
+            return key
+    return None
+
+
+def draw_button_hover(screen, buttons, hovered, theme):
+    if hovered is None:
+        return None
+    rect = buttons[hovered]
+    pygame.draw.rect(screen, theme["selected"], rect, 3, border_radius=config.BUTTON_RADIUS)
+    return rect
+
+
 def draw_move_counter(screen, fonts, move_count, score, theme):
-    moves_surface = fonts["counter"].render(
-        f"Moves: {move_count}", True, theme["muted_text"]
+    moves_surface = render_text(
+        fonts["counter"], f"Moves: {move_count}", theme["muted_text"]
     )
-    score_surface = fonts["counter"].render(
-        f"Score: {score}", True, theme["muted_text"]
+    score_surface = render_text(
+        fonts["counter"], f"Score: {score}", theme["muted_text"]
+    )
+    moves_rect = screen.blit(moves_surface, (10, 10))
+    score_rect = screen.blit(score_surface, (10, 10 + moves_surface.get_height() + 4))
+    return moves_rect.union(score_rect)
+
+
+def draw_solver_progress(screen, fonts, progress, theme):
+    text = (
+        f"Assignments: {progress.assignments}   "
+        f"Backtracks: {progress.backtracks}   "
+        f"Depth: {progress.depth}"
+    )
+    surface = fonts["counter"].render(text, True, theme["muted_text"])
+    offset_x, offset_y = get_grid_offset()
+    return screen.blit(
+        surface,
+        (
+            offset_x + (config.GRID_SIZE - surface.get_width()) // 2,
+            offset_y + config.GRID_SIZE + 16,
+        ),
     )
-    screen.blit(moves_surface, (10, 10))
-    screen.blit(score_surface, (10, 10 + moves_surface.get_height() + 4))
+
+
+def draw_profiler(screen, fonts, lines, theme):
+    offset_x, _ = get_grid_offset()
+    drawn = None
+    y_pos = 8
+    for line in lines:
+        surface = fonts["counter"].render(line, True, theme["muted_text"])
+        rect = screen.blit(surface, (offset_x, y_pos))
+        drawn = rect if drawn is None else drawn.union(rect)
+        y_pos += surface.get_height()
+    return drawn
 
 
 def wrap_text(font, text, max_width):
@@ -213,13 +409,65 @@ def wrap_text(font, text, max_width):
     return lines
 
 
-def draw_console(screen, fonts, console_messages, theme):
-    console_rect = pygame.Rect(
+class LogEntry:
+    __slots__ = ("message", "layouts")
+
+    def __init__(self, message):
+        self.message = message
+        self.layouts = {}
+
+
+class ActivityLog:
+    def __init__(self, max_messages=config.MAX_CONSOLE_MESSAGES):
+        self._entries = deque(maxlen=max_messages)
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def append(self, message):
+        self._entries.append(LogEntry(message))
+        self.version += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.version += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return (entry.message for entry in self._entries)
+
+    def __getitem__(self, index):
+        return self._entries[index].message
+
+    def iter_lines(self, font, width, color):
+        key = (font, width, color)
+        for entry in reversed(self._entries):
+            surfaces = entry.layouts.get(key)
+            if surfaces is None:
+                self.misses += 1
+                surfaces = [
+                    font.render(line, True, color)
+                    for line in wrap_text(font, entry.message, width)
+                ]
+                entry.layouts[key] = surfaces
+            else:
+                self.hits += 1
+            yield surfaces
+
+
+def get_console_rect():
+    return pygame.Rect(
         5,
         (config.SCREEN_HEIGHT - config.CONSOLE_HEIGHT) // 2,
         config.CONSOLE_WIDTH,
         config.CONSOLE_HEIGHT,
     )
+
+
+def draw_console_panel(screen, fonts, theme):
+    console_rect = get_console_rect()
     draw_shadow(
         screen,
         console_rect,
@@ -234,21 +482,26 @@ def draw_console(screen, fonts, console_messages, theme):
         theme["panel_border"],
         config.PANEL_RADIUS,
     )
-
+    header_text = render_text(fonts["console"], config.ACTIVITY_LOG_TEXT, theme["text"])
     padding = config.CONSOLE_PADDING
-    header_text = fonts["console"].render(
-        config.ACTIVITY_LOG_TEXT, True, theme["text"]
-    )
-    header_pos = (console_rect.x + padding, console_rect.y + padding)
-    screen.blit(header_text, header_pos)
+    screen.blit(header_text, (console_rect.x + padding, console_rect.y + padding))
 
-    content_top = header_pos[1] + header_text.get_height() + config.CONSOLE_HEADER_SPACING
-    inner_rect = pygame.Rect(
+
+def get_console_inner_rect(fonts):
+    console_rect = get_console_rect()
+    padding = config.CONSOLE_PADDING
+    header_height = fonts["console"].size(config.ACTIVITY_LOG_TEXT)[1]
+    content_top = console_rect.y + padding + header_height + config.CONSOLE_HEADER_SPACING
+    return pygame.Rect(
         console_rect.x + padding,
         content_top,
         console_rect.width - 2 * padding,
         console_rect.bottom - padding - content_top,
     )
+
+
+def draw_console(screen, fonts, console_messages, theme):
+    inner_rect = get_console_inner_rect(fonts)
     line_height = fonts["console"].get_linesize()
     max_lines = min(
         config.CONSOLE_VISIBLE_LINES, max(1, inner_rect.height // line_height)
@@ -257,26 +510,184 @@ def draw_console(screen, fonts, console_messages, theme):
     clip_rect = screen.get_clip()
     screen.set_clip(inner_rect)
 
-    wrapped_lines = []
-    for message in reversed(console_messages):
-        for line in wrap_text(fonts["console"], message, inner_rect.width):
-            wrapped_lines.append(line)
-            if len(wrapped_lines) >= max_lines:
-                break
-        if len(wrapped_lines) >= max_lines:
+    drawn = 0
+    layouts = console_messages.iter_lines(fonts["console"], inner_rect.width, theme["text"])
+    for surfaces in layouts:
+        for surface in surfaces[: max_lines - drawn]:
+            screen.blit(surface, (inner_rect.x, inner_rect.y + drawn * line_height))
+            drawn += 1
+        if drawn >= max_lines:
             break
 
-    for i, line in enumerate(wrapped_lines):
-        text_surface = fonts["console"].render(line, True, theme["text"])
-        screen.blit(text_surface, (inner_rect.x, inner_rect.y + i * line_height))
-
     screen.set_clip(clip_rect)
+    return inner_rect
+
+
+def _skip_mark(stage):
+    pass
+
+
+class DirtyRenderer:
+    def __init__(self, layer=None):
+        self.layer = layer or static_layer
+        self.full_redraws = 0
+        self.partial_redraws = 0
+        self._key = None
+        self._cells = [None] * 81
+        self._regions = {}
+
+    def invalidate(self):
+        self._key = None
+
+    def render(
+        self,
+        screen,
+        board,
+        fonts,
+        buttons,
+        theme,
+        selected_cell=None,
+        highlight_cell=None,
+        move_count=0,
+        score=0,
+        progress=None,
+        console_messages=None,
+        hovered=None,
+        overlays=None,
+        profile_lines=None,
+        profiler=None,
+    ):
+        mark = profiler.mark if profiler is not None else _skip_mark
+        overlay_state = overlays.version if overlays else None
+        key = (id(screen), screen.get_size(), id(theme), overlay_state)
+        full = self.layer.ensure(screen, fonts, buttons, theme) or key != self._key
+        if full:
+            self._key = key
+            screen.blit(self.layer.surface, (0, 0))
+        dirty = []
+
+        conflicts = board.get_conflicts()
+        cells = {}
+        for index in range(81):
+            row, col = divmod(index, 9)
+            state = (
+                board.get_value(row, col),
+                get_cell_color(board, row, col, conflicts),
+                selected_cell == (row, col),
+                highlight_cell == (row, col),
+            )
+            if full or state != self._cells[index]:
+                cells[index] = state
+
+        progress_state = None
+        if progress is not None:
+            progress_state = (progress.assignments, progress.backtracks, progress.depth)
+        console_state = None if console_messages is None else console_messages.version
+        profile_state = tuple(profile_lines) if profile_lines else None
+        regions = {
+            "counter": (move_count, score),
+            "progress": progress_state,
+            "console": console_state,
+            "hover": hovered,
+            "profiler": profile_state,
+        }
+        changed_rects = [get_cell_rect(*divmod(index, 9)) for index in cells]
+        redraw = {
+            name
+            for name, state in regions.items()
+            if self._clear(screen, dirty, full, name, state, changed_rects, cells)
+        }
+        mark("layer")
+
+        for index, state in cells.items():
+            self._cells[index] = state
+            rect = get_cell_rect(*divmod(index, 9))
+            if not full:
+                self.layer.restore(screen, rect)
+                dirty.append(rect)
+            draw_cell(screen, rect, *state, fonts, theme)
+        mark("grid")
+
+        if "counter" in redraw:
+            rect = draw_move_counter(screen, fonts, move_count, score, theme)
+            self._mark(dirty, full, "counter", rect)
+        mark("counter")
+
+        if "progress" in redraw and progress is not None:
+            rect = draw_solver_progress(screen, fonts, progress, theme)
+            self._mark(dirty, full, "progress", rect)
+        mark("progress")
+
+        if "console" in redraw and console_state is not None:
+            rect = draw_console(screen, fonts, console_messages, theme)
+            self._mark(dirty, full, "console", rect)
+        mark("console")
+
+        if "hover" in redraw and hovered:
+            rect = draw_button_hover(screen, buttons, hovered, theme)
+            self._mark(dirty, full, "hover", rect)
+        mark("hover")
+
+        if "profiler" in redraw and profile_state:
+            rect = draw_profiler(screen, fonts, profile_lines, theme)
+            self._mark(dirty, full, "profiler", rect)
+        mark("profiler")
+
+        if overlay_state is not None and dirty:
+            self.invalidate()
+            return self.render(
+                screen,
+                board,
+                fonts,
+                buttons,
+                theme,
+                selected_cell,
+                highlight_cell,
+                move_count,
+                score,
+                progress,
+                console_messages,
+                hovered,
+                overlays,
+                profile_lines,
+                profiler,
+            )
+        if full:
+            if overlays:
+                overlays.draw(screen, fonts, theme)
+                mark("overlays")
+            self.full_redraws += 1
+            return [screen.get_rect()]
+        if dirty:
+            self.partial_redraws += 1
+        return dirty
+
+    def _clear(self, screen, dirty, full, name, state, changed_rects, cells):
+        previous = self._regions.get(name)
+        if full or previous is None:
+            self._regions[name] = (state, None)
+            return True
+        rect = previous[1]
+        covered = rect is not None and rect.collidelist(changed_rects) >= 0
+        if previous[0] == state and not covered:
+            return False
+        if rect is not None:
+            self.layer.restore(screen, rect)
+            dirty.append(rect)
+            for index in range(81):
+                if index not in cells and rect.colliderect(get_cell_rect(*divmod(index, 9))):
+                    cells[index] = self._cells[index]
+        self._regions[name] = (state, None)
+        return True
+
+    def _mark(self, dirty, full, name, rect):
+        self._regions[name] = (self._regions[name][0], rect)
+        if not full:
+            dirty.append(rect)
 
 
 def log_message(console_messages, message):
     console_messages.append(message)
-    if len(console_messages) > config.MAX_CONSOLE_MESSAGES:
-        console_messages.pop(0)
 
 
 def get_cell_from_mouse(pos):
@@ -287,308 +698,3 @@ def get_cell_from_mouse(pos):
     if 0 <= row < 9 and 0 <= col < 9:
         return row, col
     return None
-
-
-def render_instructions(screen, fonts, theme):
-    instruction_window = pygame.display.set_mode(
-        (config.INSTRUCTIONS_WIDTH, config.INSTRUCTIONS_HEIGHT)
-    )
-    pygame.display.set_caption(config.INSTRUCTIONS_CAPTION)
-    instruction_window.fill(theme["background"])
-
-    instructions = [
-        "Welcome to Sudoku!",
-        "1. Click on a cell to select it.",
-        "2. Type a number 1 through 9 on your keyboard to place it in the cell.",
-        "3. To delete a number from a cell, press backspace or 0.",
-        "4. Cells with darker numbers are given clues and cannot be edited.",
-        "5. Use the Solver button to solve the board automatically.",
-        "6. Use the Easy, Medium, or Hard buttons to start a new game.",
-        "7. To win, fill the board correctly with numbers 1 through 9.",
-        "8. View the leaderboard using the Leaderboard button.",
-        "9. Your score is saved after completing a puzzle.",
-        "Press T to toggle the theme.",
-        "Press ESC to return to the game.",
-    ]
-
-    y_offset = 20
-    for line in instructions:
-        text_surface = fonts["console"].render(line, True, theme["text"])
-        instruction_window.blit(text_surface, (20, y_offset))
-        y_offset += 40
-
-    pygame.display.flip()
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
-                pygame.display.set_caption(config.WINDOW_CAPTION)
-                return screen
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
-                pygame.display.set_caption(config.WINDOW_CAPTION)
-                return screen
-
-
-def prompt_save_score(screen, fonts, theme, score):
-    prompt_window = pygame.display.set_mode(
-        (config.NAME_PROMPT_WIDTH, config.NAME_PROMPT_HEIGHT)
-    )
-    pygame.display.set_caption(config.NAME_PROMPT_CAPTION)
-
-    clock = pygame.time.Clock()
-
-    panel_rect = pygame.Rect(
-        20,
-        20,
-        config.NAME_PROMPT_WIDTH - 40,
-        config.NAME_PROMPT_HEIGHT - 40,
-    )
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
-                pygame.display.set_caption(config.WINDOW_CAPTION)
-                return screen, None
-            if event.type == pygame.KEYDOWN:
-                if event.key in (pygame.K_y, pygame.K_RETURN):
-                    screen = pygame.display.set_mode(
-                        (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
-                    )
-                    pygame.display.set_caption(config.WINDOW_CAPTION)
-                    return screen, True
-                if event.key in (pygame.K_n, pygame.K_ESCAPE):
-                    screen = pygame.display.set_mode(
-                        (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
-                    )
-                    pygame.display.set_caption(config.WINDOW_CAPTION)
-                    return screen, False
-
-        prompt_window.fill(theme["background"])
-        draw_shadow(
-            prompt_window,
-            panel_rect,
-            theme["shadow"],
-            config.PANEL_SHADOW_OFFSET,
-            config.PANEL_RADIUS,
-        )
-        draw_panel(
-            prompt_window,
-            panel_rect,
-            theme["panel"],
-            theme["panel_border"],
-            config.PANEL_RADIUS,
-        )
-
-        title = fonts["console"].render("Save your score?", True, theme["text"])
-        prompt_window.blit(title, (panel_rect.x + 20, panel_rect.y + 20))
-
-        score_text = fonts["counter"].render(f"Score: {score}", True, theme["muted_text"])
-        prompt_window.blit(score_text, (panel_rect.x + 20, panel_rect.y + 70))
-
-        info_lines = [
-            "Press Y to save to the leaderboard.",
-            "Press N to skip.",
-        ]
-        for index, line in enumerate(info_lines):
-            info_surface = fonts["counter"].render(line, True, theme["muted_text"])
-            prompt_window.blit(info_surface, (panel_rect.x + 20, panel_rect.y + 120 + index * 28))
-
-        pygame.display.flip()
-        clock.tick(30)
-
-
-def prompt_player_name(screen, fonts, theme, score):
-    prompt_window = pygame.display.set_mode(
-        (config.NAME_PROMPT_WIDTH, config.NAME_PROMPT_HEIGHT)
-    )
-    pygame.display.set_caption(config.NAME_PROMPT_CAPTION)
-
-    input_text = ""
-    error_message = ""
-    clock = pygame.time.Clock()
-
-    panel_rect = pygame.Rect(
-        20,
-        20,
-        config.NAME_PROMPT_WIDTH - 40,
-        config.NAME_PROMPT_HEIGHT - 40,
-    )
-    input_rect = pygame.Rect(
-        panel_rect.x + 20,
-        panel_rect.y + 110,
-        panel_rect.width - 40,
-        44,
-    )
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
-                pygame.display.set_caption(config.WINDOW_CAPTION)
-                return screen, None
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    candidate = input_text.strip()
-                    error_message = scoreboard.validate_name(candidate)
-                    if not error_message:
-                        screen = pygame.display.set_mode(
-                            (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
-                        )
-                        pygame.display.set_caption(config.WINDOW_CAPTION)
-                        return screen, candidate
-                    input_text = candidate
-                elif event.key == pygame.K_BACKSPACE:
-                    input_text = input_text[:-1]
-                elif event.unicode:
-                    if (
-                        len(input_text) < config.NAME_MAX_LENGTH
-                        and event.unicode in scoreboard.ALLOWED_NAME_CHARS
-                    ):
-                        input_text += event.unicode
-
-        prompt_window.fill(theme["background"])
-        draw_shadow(
-            prompt_window,
-            panel_rect,
-            theme["shadow"],
-            config.PANEL_SHADOW_OFFSET,
-            config.PANEL_RADIUS,
-        )
-        draw_panel(
-            prompt_window,
-            panel_rect,
-            theme["panel"],
-            theme["panel_border"],
-            config.PANEL_RADIUS,
-        )
-
-        title = fonts["console"].render("Save your score", True, theme["text"])
-        prompt_window.blit(title, (panel_rect.x + 20, panel_rect.y + 20))
-
-        score_text = fonts["counter"].render(f"Score: {score}", True, theme["muted_text"])
-        prompt_window.blit(score_text, (panel_rect.x + 20, panel_rect.y + 60))
-
-        hint = f"Name (max {config.NAME_MAX_LENGTH}):"
-        hint_text = fonts["counter"].render(hint, True, theme["muted_text"])
-        prompt_window.blit(hint_text, (input_rect.x, input_rect.y - 28))
-
-        pygame.draw.rect(prompt_window, theme["grid_bg"], input_rect, border_radius=8)
-        pygame.draw.rect(prompt_window, theme["panel_border"], input_rect, 2, border_radius=8)
-
-        display_text = input_text or " "
-        text_surface = fonts["console"].render(display_text, True, theme["text"])
-        prompt_window.blit(text_surface, (input_rect.x + 10, input_rect.y + 6))
-
-        if error_message:
-            error_lines = wrap_text(fonts["counter"], error_message, panel_rect.width - 40)
-            for index, line in enumerate(error_lines):
-                error_surface = fonts["counter"].render(line, True, theme["given_text"])
-                prompt_window.blit(
-                    error_surface,
-                    (panel_rect.x + 20, input_rect.bottom + 12 + index * 22),
-                )
-        else:
-            help_text = "Press Enter to save."
-            help_surface = fonts["counter"].render(help_text, True, theme["muted_text"])
-            prompt_window.blit(help_surface, (panel_rect.x + 20, input_rect.bottom + 14))
-
-        pygame.display.flip()
-        clock.tick(30)
-
-
-def render_leaderboard(screen, fonts, theme, entries):
-    leaderboard_window = pygame.display.set_mode(
-        (config.LEADERBOARD_WIDTH, config.LEADERBOARD_HEIGHT)
-    )
-    pygame.display.set_caption(config.LEADERBOARD_CAPTION)
-
-    clock = pygame.time.Clock()
-
-    panel_rect = pygame.Rect(
-        24,
-        24,
-        config.LEADERBOARD_WIDTH - 48,
-        config.LEADERBOARD_HEIGHT - 48,
-    )
-    line_height = fonts["console"].get_linesize()
-
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
-                pygame.display.set_caption(config.WINDOW_CAPTION)
-                return screen
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
-                pygame.display.set_caption(config.WINDOW_CAPTION)
-                return screen
-
-        leaderboard_window.fill(theme["background"])
-        draw_shadow(
-            leaderboard_window,
-            panel_rect,
-            theme["shadow"],
-            config.PANEL_SHADOW_OFFSET,
-            config.PANEL_RADIUS,
-        )
-        draw_panel(
-            leaderboard_window,
-            panel_rect,
-            theme["panel"],
-            theme["panel_border"],
-            config.PANEL_RADIUS,
-        )
-
-        header_y = panel_rect.y + 20
-        title = fonts["console"].render("Leaderboard", True, theme["text"])
-        leaderboard_window.blit(title, (panel_rect.x + 20, header_y))
-
-        col_rank = panel_rect.x + 20
-        col_name = panel_rect.x + 90
-        col_score = panel_rect.right - 120
-        header_y += line_height + 10
-
-        header_rank = fonts["counter"].render("Rank", True, theme["muted_text"])
-        header_name = fonts["counter"].render("Player", True, theme["muted_text"])
-        header_score = fonts["counter"].render("Score", True, theme["muted_text"])
-        leaderboard_window.blit(header_rank, (col_rank, header_y))
-        leaderboard_window.blit(header_name, (col_name, header_y))
-        leaderboard_window.blit(header_score, (col_score, header_y))
-
-        content_y = header_y + line_height + 8
-        if not entries:
-            empty_text = fonts["counter"].render(
-                "No scores yet. Finish a puzzle to add one!", True, theme["muted_text"]
-            )
-            leaderboard_window.blit(empty_text, (panel_rect.x + 20, content_y))
-        else:
-            max_entries = min(config.LEADERBOARD_MAX_ENTRIES, len(entries))
-            for index in range(max_entries):
-                entry = entries[index]
-                rank_text = fonts["counter"].render(
-                    str(index + 1), True, theme["text"]
-                )
-                name_text = fonts["counter"].render(
-                    entry["name"], True, theme["text"]
-                )
-                score_text = fonts["counter"].render(
-                    str(entry["score"]), True, theme["text"]
-                )
-                y_pos = content_y + index * (line_height + 6)
-                leaderboard_window.blit(rank_text, (col_rank, y_pos))
-                leaderboard_window.blit(name_text, (col_name, y_pos))
-                leaderboard_window.blit(score_text, (col_score, y_pos))
-
-        footer_text = fonts["counter"].render(
-            "Press ESC to return.", True, theme["muted_text"]
-        )
-        leaderboard_window.blit(
-            footer_text,
-            (panel_rect.x + 20, panel_rect.bottom - footer_text.get_height() - 14),
-        )
-
-        pygame.display.flip()
-        clock.tick(30)